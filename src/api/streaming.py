@@ -6,7 +6,9 @@ Provides StreamingResponseWithLogging for automatic stream completion logging.
 from __future__ import annotations
 
 import logging
+import queue
 import time
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, AsyncIterator
 
 from starlette.responses import StreamingResponse
@@ -15,6 +17,95 @@ from ..core import RequestContext, get_context, record_stream_completion
 
 logger = logging.getLogger(__name__)
 
+# Completion records queued for the background listener before falling back
+# to synchronous emission
+LOG_QUEUE_MAXSIZE = 10000
+
+# (status, level) for a stream that succeeded, errored, or lost its client
+_COMPLETION_OUTCOMES = (
+    ("success", logging.INFO),
+    ("error", logging.ERROR),
+    ("client_disconnect", logging.WARNING),
+)
+
+_log_listener: QueueListener | None = None
+_log_queue_handler: QueueHandler | None = None
+
+
+class _FallbackQueueHandler(QueueHandler):
+    """QueueHandler that emits synchronously instead of dropping when full."""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue[logging.LogRecord],
+        fallback: tuple[logging.Handler, ...],
+    ):
+        super().__init__(log_queue)
+        self._fallback = fallback
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            for handler in self._fallback:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+class _PropagateHandler(logging.Handler):
+    """Pass records on to the handlers of this module's parent loggers.
+
+    Used as the listener's target when no handlers are given. The parent
+    handlers are looked up per record, so handlers added after the listener
+    starts (configure_structured_logging, caplog) still receive records.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if logger.parent is not None:
+            logger.parent.callHandlers(record)
+
+
+def start_log_listener(*handlers: logging.Handler) -> None:
+    """Hand this module's log records to a background thread.
+
+    Stream completion is logged from inside the response generator, so a
+    slow handler (file, network) would otherwise stall the request. Records
+    go through a bounded queue to a QueueListener that owns the real
+    handlers; if the queue is full they are emitted synchronously rather
+    than dropped.
+
+    Args:
+        *handlers: Handlers to emit to. By default records are propagated to
+            whatever handlers the parent loggers have at emit time, as they
+            would be without the listener.
+    """
+    global _log_listener, _log_queue_handler
+    if _log_listener is not None:
+        return
+
+    targets = handlers or (_PropagateHandler(),)
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+    _log_listener = QueueListener(log_queue, *targets, respect_handler_level=True)
+    _log_queue_handler = _FallbackQueueHandler(log_queue, targets)
+
+    logger.addHandler(_log_queue_handler)
+    logger.propagate = False
+    _log_listener.start()
+
+
+def stop_log_listener() -> None:
+    """Flush queued records and restore synchronous logging for this module."""
+    global _log_listener, _log_queue_handler
+    if _log_listener is None:
+        return
+
+    if _log_queue_handler is not None:
+        logger.removeHandler(_log_queue_handler)
+    logger.propagate = True
+    _log_listener.stop()
+    _log_listener = None
+    _log_queue_handler = None
+
 
 class StreamingResponseWithLogging(StreamingResponse):
     """StreamingResponse that automatically logs on completion.
@@ -61,7 +152,7 @@ class StreamingResponseWithLogging(StreamingResponse):
         """Wrap content generator with logging on completion."""
         bytes_sent = 0
         chunks_sent = 0
-        start_time = time.monotonic()
+        start_ns = time.perf_counter_ns()
         error: Exception | None = None
         disconnect = False
 
@@ -89,7 +180,7 @@ class StreamingResponseWithLogging(StreamingResponse):
             raise
 
         finally:
-            duration = time.monotonic() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
 
             # Log completion
             self._log_completion(
@@ -112,15 +203,11 @@ class StreamingResponseWithLogging(StreamingResponse):
         disconnect: bool,
     ) -> None:
         """Log stream completion."""
-        if disconnect:
-            status = "client_disconnect"
-            level = logging.WARNING
-        elif error:
-            status = "error"
-            level = logging.ERROR
-        else:
-            status = "success"
-            level = logging.INFO
+        status, level = _COMPLETION_OUTCOMES[2 if disconnect else 1 if error else 0]
+
+        # The message itself is formatted lazily, but the extra fields are not
+        if not logger.isEnabledFor(level):
+            return
 
         request_id = self._context.request_id if self._context else "-"
         path = self._context.path if self._context else "-"
@@ -174,7 +261,7 @@ async def wrap_stream_with_logging(
 
     bytes_sent = 0
     chunks_sent = 0
-    start_time = time.monotonic()
+    start_ns = time.perf_counter_ns()
     error: Exception | None = None
     disconnect = False
 
@@ -199,17 +286,18 @@ async def wrap_stream_with_logging(
         raise
 
     finally:
-        duration = time.monotonic() - start_time
-
-        status = "client_disconnect" if disconnect else ("error" if error else "success")
-        request_id = context.request_id if context else "-"
-
-        logger.info(
-            "[%s] stream_completed status=%s bytes=%d duration=%.3fs",
-            request_id,
-            status,
-            bytes_sent,
-            duration,
-        )
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+
+        if logger.isEnabledFor(logging.INFO):
+            status = _COMPLETION_OUTCOMES[2 if disconnect else 1 if error else 0][0]
+            request_id = context.request_id if context else "-"
+
+            logger.info(
+                "[%s] stream_completed status=%s bytes=%d duration=%.3fs",
+                request_id,
+                status,
+                bytes_sent,
+                duration,
+            )
 
         record_stream_completion(bytes_sent, duration)
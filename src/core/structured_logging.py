@@ -11,7 +11,8 @@ from __future__ import annotations
 import json
 import logging
 import sys
-from datetime import datetime, timezone
+import time
+from functools import lru_cache
 from typing import Any
 
 # Graceful degradation for structlog
@@ -25,6 +26,54 @@ except ImportError:
     STRUCTLOG_AVAILABLE = False
     structlog = None  # type: ignore[assignment]
 
+_LEVEL_NAMES = {
+    logging.DEBUG: "debug",
+    logging.INFO: "info",
+    logging.WARNING: "warning",
+    logging.ERROR: "error",
+    logging.CRITICAL: "critical",
+}
+
+
+# Whole-second prefix of the last timestamp formatted; records tend to arrive
+# in bursts within the same second, so the date formatting is mostly reused
+_ts_cache: tuple[int, str] = (-1, "")
+
+
+def _iso_timestamp(created: float) -> str:
+    """Format a record's creation time as an ISO 8601 UTC timestamp.
+
+    Args:
+        created: Seconds since the epoch (LogRecord.created)
+
+    Returns:
+        Timestamp like ``2025-01-01T12:00:00.123456+00:00``
+    """
+    global _ts_cache
+    seconds = int(created)
+    cached_seconds, prefix = _ts_cache
+    if seconds != cached_seconds:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _ts_cache = (seconds, prefix)
+    micros = int((created - seconds) * 1_000_000)
+    return f"{prefix}.{micros:06d}+00:00"
+
+
+# Output of JSONFormatter for a record with no extra fields or exception; the
+# key order matches the dict built on the slow path
+_JSON_TEMPLATE = '{"timestamp":"%s","level":%s,"logger":%s,"message":%s}'
+
+
+def _json_string(value: str) -> str:
+    """Encode a message string as JSON, escaping non-ASCII like json.dumps does."""
+    return json.encoder.encode_basestring_ascii(value)
+
+
+@lru_cache(maxsize=1024)
+def _json_name(value: str | None) -> str:
+    """Encode a logger or level name as JSON; names repeat across records."""
+    return json.dumps(value)
+
 
 class JSONFormatter(logging.Formatter):
     """JSON formatter for standard logging (fallback when structlog unavailable).
@@ -41,22 +90,41 @@ class JSONFormatter(logging.Formatter):
         Returns:
             JSON-formatted log string
         """
+        level = _LEVEL_NAMES.get(record.levelno) or record.levelname.lower()
+        extra = getattr(record, "extra", None)
+
+        # getMessage() only adds str() and %-formatting, neither needed here
+        msg = record.msg
+        if record.args or msg.__class__ is not str:
+            msg = record.getMessage()
+
+        if not (extra or record.exc_info or record.exc_text):
+            return _JSON_TEMPLATE % (
+                _iso_timestamp(record.created),
+                _json_name(level),
+                _json_name(record.name),
+                _json_string(msg),
+            )
+
         log_data: dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "level": record.levelname.lower(),
+            "timestamp": _iso_timestamp(record.created),
+            "level": level,
             "logger": record.name,
-            "message": record.getMessage(),
+            "message": msg,
         }
 
         # Add extra fields if present
-        if hasattr(record, "extra") and record.extra:
-            log_data.update(record.extra)
+        if extra:
+            log_data.update(extra)
 
-        # Add exception info if present
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+        # Add exception info if present, reusing the traceback text cached on
+        # the record when another handler has already formatted it
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_data["exception"] = record.exc_text
 
-        return json.dumps(log_data, default=str)
+        return json.dumps(log_data, default=str, separators=(",", ":"))
 
 
 def configure_structured_logging(
@@ -133,10 +201,17 @@ def configure_structured_logging(
         root_logger.addHandler(handler)
 
 
+# Whether structlog is available can't change after import, so pick the
+# logger factory once instead of branching on every call
+_logger_factory: Any = structlog.get_logger if structlog is not None else logging.getLogger
+
+
+@lru_cache(maxsize=256)
 def get_logger(name: str) -> Any:
     """Get a logger instance.
 
-    Returns structlog logger if available, standard logger otherwise.
+    Returns structlog logger if available, standard logger otherwise. Loggers
+    are cached per name, since structlog builds a new proxy on every call.
 
     Args:
         name: Logger name (typically __name__)
@@ -144,31 +219,38 @@ def get_logger(name: str) -> Any:
     Returns:
         Logger instance
     """
-    if STRUCTLOG_AVAILABLE and structlog is not None:
-        return structlog.get_logger(name)
-    return logging.getLogger(name)
+    return _logger_factory(name)
 
 
-def bind_context(**kwargs: Any) -> None:
-    """Bind context variables to all subsequent log messages.
+# Bound once at import: STRUCTLOG_AVAILABLE never changes afterwards, so the
+# per-request helpers don't need to re-check it on every call
+if STRUCTLOG_AVAILABLE and structlog is not None:
 
-    Only works with structlog. No-op if structlog unavailable.
+    def bind_context(**kwargs: Any) -> None:
+        """Bind context variables to all subsequent log messages.
 
-    Args:
-        **kwargs: Context variables to bind
-    """
-    if STRUCTLOG_AVAILABLE and structlog is not None:
-        structlog.contextvars.bind_contextvars(**kwargs)
+        Only works with structlog. No-op if structlog unavailable.
 
+        Args:
+            **kwargs: Context variables to bind
+        """
+        structlog.contextvars.bind_contextvars(**kwargs)
 
-def clear_context() -> None:
-    """Clear bound context variables.
+    def clear_context() -> None:
+        """Clear bound context variables.
 
-    Only works with structlog. No-op if structlog unavailable.
-    """
-    if STRUCTLOG_AVAILABLE and structlog is not None:
+        Only works with structlog. No-op if structlog unavailable.
+        """
         structlog.contextvars.clear_contextvars()
 
+else:
+
+    def bind_context(**kwargs: Any) -> None:
+        """Bind context variables (no-op: structlog is not installed)."""
+
+    def clear_context() -> None:
+        """Clear bound context variables (no-op: structlog is not installed)."""
+
 
 def is_structlog_available() -> bool:
     """Check if structlog is available.
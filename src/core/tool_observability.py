@@ -7,9 +7,12 @@ Handles timing between pre/post hooks and parameter sanitization.
 from __future__ import annotations
 
 import logging
+import re
 import time
 from dataclasses import dataclass, field
-from typing import Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -30,8 +33,38 @@ SENSITIVE_PATTERNS = [
     "bearer",
 ]
 
+# All SENSITIVE_PATTERNS as one case-insensitive alternation, so keys and
+# values are scanned once instead of once per pattern. Patterns containing
+# another pattern (e.g. "api_key" contains "key") can never be the first to
+# match, so they are left out of the alternation.
+_SENSITIVE_RE = re.compile(
+    "|".join(
+        re.escape(pattern)
+        for pattern in SENSITIVE_PATTERNS
+        if not any(other != pattern and other in pattern for other in SENSITIVE_PATTERNS)
+    ),
+    re.IGNORECASE,
+)
+
+# Strings shorter than this can't contain any pattern and skip the scan
+_MIN_PATTERN_LENGTH = min(map(len, SENSITIVE_PATTERNS))
+
+# Longer string values are cut to this many characters plus the suffix
+MAX_LOGGED_VALUE_LENGTH = 500
+_TRUNCATED_SUFFIX = "...[truncated]"
+
+
+@lru_cache(maxsize=1024)
+def _is_sensitive_key(key: str) -> bool:
+    """Check a dict key against SENSITIVE_PATTERNS.
+
+    Tool metadata and inputs reuse a small set of key names, so the answer
+    is cached per key and repeat keys cost a single hash lookup.
+    """
+    return _SENSITIVE_RE.search(key) is not None
+
 
-@dataclass
+@dataclass(slots=True)
 class ToolInvocationState:
     """Track state of a tool invocation between pre/post hooks."""
 
@@ -39,7 +72,7 @@ class ToolInvocationState:
     tool_name: str
     tool_input: dict[str, Any]
     session_id: str
-    start_time: float = field(default_factory=time.perf_counter)
+    start_ns: int = field(default_factory=time.perf_counter_ns)
 
     # Extracted metadata for specific tool types
     subagent_type: str | None = None
@@ -50,7 +83,130 @@ class ToolInvocationState:
     @property
     def duration_seconds(self) -> float:
         """Calculate elapsed time since invocation started."""
-        return time.perf_counter() - self.start_time
+        return (time.perf_counter_ns() - self.start_ns) / 1e9
+
+
+def _task_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "tool_name": tool_name,
+        "subagent_type": tool_input.get("subagent_type", "unknown"),
+        "description": tool_input.get("description", "")[:200],
+        # Don't log full prompt - may contain sensitive data, just log length
+        "prompt_length": len(tool_input.get("prompt", "")),
+        "run_in_background": tool_input.get("run_in_background", False),
+    }
+
+
+def _skill_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "tool_name": tool_name,
+        "skill_name": tool_input.get("skill", "unknown"),
+        "args": tool_input.get("args", "")[:100],
+    }
+
+
+def _bash_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    command = tool_input.get("command", "")
+    return {
+        "tool_name": tool_name,
+        # Truncate command to avoid logging sensitive data
+        "command": command[:200],
+        "command_length": len(command),
+        "run_in_background": tool_input.get("run_in_background", False),
+        "timeout": tool_input.get("timeout"),
+    }
+
+
+def _read_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "tool_name": tool_name,
+        "file_path": tool_input.get("file_path", ""),
+        "offset": tool_input.get("offset"),
+        "limit": tool_input.get("limit"),
+    }
+
+
+def _write_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "tool_name": tool_name,
+        "file_path": tool_input.get("file_path", ""),
+        "content_length": len(tool_input.get("content", "")),
+    }
+
+
+def _edit_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "tool_name": tool_name,
+        "file_path": tool_input.get("file_path", ""),
+        "old_string_length": len(tool_input.get("old_string", "")),
+        "new_string_length": len(tool_input.get("new_string", "")),
+        "replace_all": tool_input.get("replace_all", False),
+    }
+
+
+def _webfetch_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "tool_name": tool_name,
+        "url": tool_input.get("url", ""),
+        "prompt_length": len(tool_input.get("prompt", "")),
+    }
+
+
+def _websearch_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {"tool_name": tool_name, "query": tool_input.get("query", "")}
+
+
+def _glob_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "tool_name": tool_name,
+        "pattern": tool_input.get("pattern", ""),
+        "path": tool_input.get("path", ""),
+    }
+
+
+def _grep_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "tool_name": tool_name,
+        "pattern": tool_input.get("pattern", ""),
+        "path": tool_input.get("path", ""),
+        "output_mode": tool_input.get("output_mode", "files_with_matches"),
+    }
+
+
+def _notebook_edit_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "tool_name": tool_name,
+        "notebook_path": tool_input.get("notebook_path", ""),
+        "edit_mode": tool_input.get("edit_mode", "replace"),
+        "cell_type": tool_input.get("cell_type"),
+    }
+
+
+def _todo_write_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {"tool_name": tool_name, "todo_count": len(tool_input.get("todos", []))}
+
+
+def _ask_user_question_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
+    return {"tool_name": tool_name, "question_count": len(tool_input.get("questions", []))}
+
+
+# Per-tool metadata extractors, looked up by tool name. Each builds the whole
+# metadata dict, tool_name first, as a single literal.
+_METADATA_EXTRACTORS: dict[str, Callable[[str, dict[str, Any]], dict[str, Any]]] = {
+    "Task": _task_metadata,
+    "Skill": _skill_metadata,
+    "Bash": _bash_metadata,
+    "Read": _read_metadata,
+    "Write": _write_metadata,
+    "Edit": _edit_metadata,
+    "WebFetch": _webfetch_metadata,
+    "WebSearch": _websearch_metadata,
+    "Glob": _glob_metadata,
+    "Grep": _grep_metadata,
+    "NotebookEdit": _notebook_edit_metadata,
+    "TodoWrite": _todo_write_metadata,
+    "AskUserQuestion": _ask_user_question_metadata,
+}
 
 
 def extract_tool_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
@@ -63,79 +219,10 @@ def extract_tool_metadata(tool_name: str, tool_input: dict[str, Any]) -> dict[st
     Returns:
         Dict of extracted metadata for logging
     """
-    metadata: dict[str, Any] = {"tool_name": tool_name}
-
-    if tool_name == "Task":
-        metadata["subagent_type"] = tool_input.get("subagent_type", "unknown")
-        description = tool_input.get("description", "")
-        metadata["description"] = description[:200] if len(description) > 200 else description
-        # Don't log full prompt - may contain sensitive data, just log length
-        prompt = tool_input.get("prompt", "")
-        metadata["prompt_length"] = len(prompt)
-        metadata["run_in_background"] = tool_input.get("run_in_background", False)
-
-    elif tool_name == "Skill":
-        metadata["skill_name"] = tool_input.get("skill", "unknown")
-        args = tool_input.get("args", "")
-        metadata["args"] = args[:100] if len(args) > 100 else args
-
-    elif tool_name == "Bash":
-        command = tool_input.get("command", "")
-        # Truncate command to avoid logging sensitive data
-        metadata["command"] = command[:200] if len(command) > 200 else command
-        metadata["command_length"] = len(command)
-        metadata["run_in_background"] = tool_input.get("run_in_background", False)
-        metadata["timeout"] = tool_input.get("timeout")
-
-    elif tool_name == "Read":
-        metadata["file_path"] = tool_input.get("file_path", "")
-        metadata["offset"] = tool_input.get("offset")
-        metadata["limit"] = tool_input.get("limit")
-
-    elif tool_name == "Write":
-        metadata["file_path"] = tool_input.get("file_path", "")
-        content = tool_input.get("content", "")
-        metadata["content_length"] = len(content)
-
-    elif tool_name == "Edit":
-        metadata["file_path"] = tool_input.get("file_path", "")
-        old_string = tool_input.get("old_string", "")
-        new_string = tool_input.get("new_string", "")
-        metadata["old_string_length"] = len(old_string)
-        metadata["new_string_length"] = len(new_string)
-        metadata["replace_all"] = tool_input.get("replace_all", False)
-
-    elif tool_name == "WebFetch":
-        metadata["url"] = tool_input.get("url", "")
-        prompt = tool_input.get("prompt", "")
-        metadata["prompt_length"] = len(prompt)
-
-    elif tool_name == "WebSearch":
-        metadata["query"] = tool_input.get("query", "")
-
-    elif tool_name == "Glob":
-        metadata["pattern"] = tool_input.get("pattern", "")
-        metadata["path"] = tool_input.get("path", "")
-
-    elif tool_name == "Grep":
-        metadata["pattern"] = tool_input.get("pattern", "")
-        metadata["path"] = tool_input.get("path", "")
-        metadata["output_mode"] = tool_input.get("output_mode", "files_with_matches")
-
-    elif tool_name == "NotebookEdit":
-        metadata["notebook_path"] = tool_input.get("notebook_path", "")
-        metadata["edit_mode"] = tool_input.get("edit_mode", "replace")
-        metadata["cell_type"] = tool_input.get("cell_type")
-
-    elif tool_name == "TodoWrite":
-        todos = tool_input.get("todos", [])
-        metadata["todo_count"] = len(todos)
-
-    elif tool_name == "AskUserQuestion":
-        questions = tool_input.get("questions", [])
-        metadata["question_count"] = len(questions)
-
-    return metadata
+    extractor = _METADATA_EXTRACTORS.get(tool_name)
+    if extractor is None:
+        return {"tool_name": tool_name}
+    return extractor(tool_name, tool_input)
 
 
 def sanitize_for_logging(data: dict[str, Any]) -> dict[str, Any]:
@@ -149,31 +236,45 @@ def sanitize_for_logging(data: dict[str, Any]) -> dict[str, Any]:
     """
     sanitized: dict[str, Any] = {}
 
-    for key, value in data.items():
-        key_lower = key.lower()
-
-        # Check if key contains sensitive pattern
-        if any(pattern in key_lower for pattern in SENSITIVE_PATTERNS):
-            sanitized[key] = "[REDACTED]"
-        elif isinstance(value, str):
-            # Check if value contains sensitive patterns
-            value_lower = value.lower()
-            if any(pattern in value_lower for pattern in SENSITIVE_PATTERNS):
-                sanitized[key] = "[REDACTED]"
-            elif len(value) > 500:
-                sanitized[key] = value[:500] + "...[truncated]"
+    # Nested dicts are walked with an explicit stack of (source, destination)
+    # pairs instead of recursion. Each destination is inserted into its parent
+    # before it is filled, so key order and structure match the input.
+    pending: list[tuple[dict[str, Any], dict[str, Any]]] = [(data, sanitized)]
+
+    while pending:
+        source, dest = pending.pop()
+
+        for key, value in source.items():
+            # Check if key contains sensitive pattern
+            if _is_sensitive_key(key):
+                dest[key] = "[REDACTED]"
+            elif isinstance(value, str):
+                # Check if value contains sensitive patterns
+                length = len(value)
+                if length >= _MIN_PATTERN_LENGTH and _SENSITIVE_RE.search(value):
+                    dest[key] = "[REDACTED]"
+                elif length > MAX_LOGGED_VALUE_LENGTH:
+                    dest[key] = value[:MAX_LOGGED_VALUE_LENGTH] + _TRUNCATED_SUFFIX
+                else:
+                    dest[key] = value
+            elif isinstance(value, dict):
+                # Sanitize nested dicts
+                child: dict[str, Any] = {}
+                dest[key] = child
+                pending.append((value, child))
+            elif isinstance(value, list):
+                # Sanitize list items if they're dicts
+                items: list[Any] = []
+                for item in value:
+                    if isinstance(item, dict):
+                        child = {}
+                        pending.append((item, child))
+                        items.append(child)
+                    else:
+                        items.append(item)
+                dest[key] = items
             else:
-                sanitized[key] = value
-        elif isinstance(value, dict):
-            # Recursively sanitize nested dicts
-            sanitized[key] = sanitize_for_logging(value)
-        elif isinstance(value, list):
-            # Sanitize list items if they're dicts
-            sanitized[key] = [
-                sanitize_for_logging(item) if isinstance(item, dict) else item for item in value
-            ]
-        else:
-            sanitized[key] = value
+                dest[key] = value
 
     return sanitized
 
@@ -269,6 +370,18 @@ def get_pending_invocations() -> dict[str, ToolInvocationState]:
     return _invocation_state.copy()
 
 
+def get_pending_invocations_view() -> MappingProxyType[str, ToolInvocationState]:
+    """Get a read-only live view of pending tool invocations.
+
+    Unlike get_pending_invocations(), nothing is copied; the view reflects
+    invocations started or completed after it was taken.
+
+    Returns:
+        Read-only mapping of tool_use_id to ToolInvocationState
+    """
+    return MappingProxyType(_invocation_state)
+
+
 def clear_pending_invocations() -> None:
     """Clear all pending invocations (for cleanup/testing)."""
     _invocation_state.clear()
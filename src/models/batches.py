@@ -6,7 +6,7 @@ multiple message requests in parallel.
 
 from __future__ import annotations
 
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -114,7 +114,11 @@ class ExpiredResult(BaseModel):
     type: Literal["expired"] = "expired"
 
 
-BatchResult = SucceededResult | ErroredResult | CanceledResult | ExpiredResult
+# Tagged on ``type`` so validation dispatches straight to the matching model
+BatchResult = Annotated[
+    SucceededResult | ErroredResult | CanceledResult | ExpiredResult,
+    Field(discriminator="type"),
+]
 
 
 class BatchResultLine(BaseModel):
@@ -8,6 +8,7 @@ Gracefully degrades if tiktoken is not installed - returns None for counts.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 from typing import Any
@@ -27,6 +28,29 @@ except ImportError:
     logger.warning("tiktoken not installed - token counting will return estimates")
 
 
+# Token counts of recently encoded texts, keyed by a digest of the text so
+# message bodies aren't kept alive between requests. Oldest entry is evicted.
+_TOKEN_COUNT_CACHE_SIZE = 1024
+_token_counts: dict[bytes, int] = {}
+
+
+def _encoded_length(text: str) -> int:
+    """Encode text with tiktoken and return the token count (memoized).
+
+    Conversation history, tool names and schemas are re-sent with every
+    request, so the same strings are counted over and over. Hashing a text
+    is much cheaper than encoding it.
+    """
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    count = _token_counts.get(key)
+    if count is None:
+        count = len(_encoder.encode(text))
+        if len(_token_counts) >= _TOKEN_COUNT_CACHE_SIZE:
+            _token_counts.pop(next(iter(_token_counts)), None)
+        _token_counts[key] = count
+    return count
+
+
 def count_tokens(text: str) -> int:
     """Count tokens in a text string.
 
@@ -37,7 +61,7 @@ def count_tokens(text: str) -> int:
         Number of tokens, or estimate if tiktoken not available.
     """
     if _encoder is not None:
-        return len(_encoder.encode(text))
+        return _encoded_length(text)
     # Fallback: rough estimate (4 chars per token average)
     return len(text) // 4
 
@@ -12,6 +12,7 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -19,7 +20,7 @@ from typing import Any
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkspaceConfig:
     """Loaded workspace configuration."""
 
@@ -46,6 +47,44 @@ class WorkspaceConfig:
         )
 
 
+def _read_text(path: Path) -> str:
+    """Read a workspace file as UTF-8 text.
+
+    Reads the raw bytes and decodes them once, skipping the buffered text
+    layer read_text() sets up per file. Line endings are normalized to "\n"
+    as read_text() would.
+    """
+    text = path.read_bytes().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _scan_dir(directory: Path) -> list[os.DirEntry[str]]:
+    """List a directory's entries sorted by name, or [] if it can't be read.
+
+    DirEntry caches the file type from the directory listing, so filtering
+    entries doesn't need a stat() per file like Path.glob() and is_dir() do.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(entries, key=lambda entry: entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    except OSError as e:
+        logger.warning(f"Failed to read {directory}: {e}")
+        return []
+
+
+def _markdown_files(directory: Path) -> list[tuple[str, Path]]:
+    """Find the *.md files in a directory as (stem, path) pairs, sorted by name."""
+    return [
+        (os.path.splitext(entry.name)[0], Path(entry.path))
+        for entry in _scan_dir(directory)
+        if entry.name.endswith(".md") and entry.is_file()
+    ]
+
+
 def load_workspace(cwd: Path | str | None) -> WorkspaceConfig:
     """Load all workspace configuration from the given directory.
 
@@ -68,7 +107,7 @@ def load_workspace(cwd: Path | str | None) -> WorkspaceConfig:
     claude_md = cwd / "CLAUDE.md"
     if claude_md.exists():
         try:
-            config.claude_md = claude_md.read_text().strip()
+            config.claude_md = _read_text(claude_md).strip()
             logger.debug(f"Loaded CLAUDE.md ({len(config.claude_md)} chars)")
         except Exception as e:
             logger.warning(f"Failed to load CLAUDE.md: {e}")
@@ -77,7 +116,7 @@ def load_workspace(cwd: Path | str | None) -> WorkspaceConfig:
     mcp_json = cwd / ".mcp.json"
     if mcp_json.exists():
         try:
-            mcp_data = json.loads(mcp_json.read_text())
+            mcp_data = json.loads(mcp_json.read_bytes())
             config.mcp_config = mcp_data
             logger.debug(f"Loaded .mcp.json with {len(mcp_data)} keys")
         except Exception as e:
@@ -88,40 +127,35 @@ def load_workspace(cwd: Path | str | None) -> WorkspaceConfig:
         return config
 
     # Load commands
-    commands_dir = claude_dir / "commands"
-    if commands_dir.exists():
-        for md in sorted(commands_dir.glob("*.md")):
-            try:
-                config.commands[md.stem] = md.read_text().strip()
-            except Exception as e:
-                logger.warning(f"Failed to load command {md.stem}: {e}")
-        if config.commands:
-            logger.debug(f"Loaded {len(config.commands)} commands")
+    for name, md in _markdown_files(claude_dir / "commands"):
+        try:
+            config.commands[name] = _read_text(md).strip()
+        except Exception as e:
+            logger.warning(f"Failed to load command {name}: {e}")
+    if config.commands:
+        logger.debug(f"Loaded {len(config.commands)} commands")
 
     # Load skills
-    skills_dir = claude_dir / "skills"
-    if skills_dir.exists():
-        for skill_dir in sorted(skills_dir.iterdir()):
-            if skill_dir.is_dir():
-                skill_file = skill_dir / "SKILL.md"
-                if skill_file.exists():
-                    try:
-                        config.skills[skill_dir.name] = skill_file.read_text().strip()
-                    except Exception as e:
-                        logger.warning(f"Failed to load skill {skill_dir.name}: {e}")
-        if config.skills:
-            logger.debug(f"Loaded {len(config.skills)} skills")
-
-    # Load agents
-    agents_dir = claude_dir / "agents"
-    if agents_dir.exists():
-        for md in sorted(agents_dir.glob("*.md")):
+    for entry in _scan_dir(claude_dir / "skills"):
+        if entry.is_dir():
+            skill_file = Path(entry.path) / "SKILL.md"
             try:
-                config.agents[md.stem] = md.read_text().strip()
+                config.skills[entry.name] = _read_text(skill_file).strip()
+            except FileNotFoundError:
+                continue
             except Exception as e:
-                logger.warning(f"Failed to load agent {md.stem}: {e}")
-        if config.agents:
-            logger.debug(f"Loaded {len(config.agents)} agents")
+                logger.warning(f"Failed to load skill {entry.name}: {e}")
+    if config.skills:
+        logger.debug(f"Loaded {len(config.skills)} skills")
+
+    # Load agents
+    for name, md in _markdown_files(claude_dir / "agents"):
+        try:
+            config.agents[name] = _read_text(md).strip()
+        except Exception as e:
+            logger.warning(f"Failed to load agent {name}: {e}")
+    if config.agents:
+        logger.debug(f"Loaded {len(config.agents)} agents")
 
     return config
 
@@ -142,14 +176,16 @@ def expand_command(prompt: str, workspace: WorkspaceConfig) -> tuple[str, str |
 
     # Extract command name (first word after /)
     parts = prompt[1:].split(maxsplit=1)
-    command_name = parts[0]
-    args = parts[1] if len(parts) > 1 else ""
+    if not parts:
+        return prompt, None  # Bare "/", nothing to expand
 
-    if command_name not in workspace.commands:
+    command_name = parts[0]
+    command_content = workspace.commands.get(command_name)
+    if command_content is None:
         return prompt, None  # Unknown command, pass through
 
     # Expand command
-    command_content = workspace.commands[command_name]
+    args = parts[1] if len(parts) > 1 else ""
     if args:
         expanded = f"{command_content}\n\nUser input: {args}"
     else:
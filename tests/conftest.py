@@ -3,7 +3,7 @@
 import os
 from collections.abc import AsyncIterator, Generator
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, create_autospec, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -85,9 +85,46 @@ def mock_claude_query(mock_assistant_message: MagicMock, mock_result_message: Ma
     return mock_query
 
 
+def _warmed_up(client: TestClient) -> TestClient:
+    """Send one throwaway /v1/messages request before handing out the client.
+
+    The first request builds Starlette's middleware stack and runs the request
+    body validation path once, so that cost isn't billed to whichever test
+    happens to run first.
+    """
+    with patch("src.api.routes.process_request", return_value={"type": "message"}):
+        client.post(
+            "/v1/messages",
+            json={
+                "model": "claude-sonnet-4-5-20250514",
+                "max_tokens": 1,
+                "messages": [{"role": "user", "content": "warm-up"}],
+            },
+            headers={"x-api-key": "test"},
+        )
+    return client
+
+
+@pytest.fixture(scope="session")
+def _shared_client() -> TestClient:
+    """One warmed-up FastAPI test client for the whole session.
+
+    Lifespan is deliberately not entered: tests patch the dependencies they
+    exercise, so starting the session pool and access log would only add
+    side effects.
+    """
+    from src.api.app import app
+
+    return _warmed_up(TestClient(app))
+
+
 @pytest.fixture
-def client() -> Generator[TestClient, None, None]:
-    """Create a FastAPI test client with mocked Claude API."""
+def client(_shared_client: TestClient) -> Generator[TestClient, None, None]:
+    """Create a FastAPI test client with mocked Claude API.
+
+    The client itself is shared across the session, but the query patch and
+    any dependency overrides only last for the requesting test.
+    """
     from src.api.app import app
 
     if USE_CLAUDE_MOCK:
@@ -110,13 +147,20 @@ def client() -> Generator[TestClient, None, None]:
             yield mock_result
 
         # Patch the query function where it's used (in bridge module)
-        # Use start/stop to keep patch active during test
-        patcher = patch("src.sdk.bridge.query", mock_query)
-        patcher.start()
-        yield TestClient(app)
-        patcher.stop()
+        with patch("src.sdk.bridge.query", mock_query):
+            yield _shared_client
     else:
-        yield TestClient(app)
+        yield _shared_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def mock_request_ctx() -> MagicMock:
+    """A fresh autospec'd RequestContext mock for each test."""
+    from src.core.context import RequestContext
+
+    mock_ctx: MagicMock = create_autospec(RequestContext, instance=True)
+    return mock_ctx
 
 
 @pytest.fixture
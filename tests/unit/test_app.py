@@ -1,15 +1,8 @@
 """Unit tests for the FastAPI app module."""
 
-import pytest
 from fastapi.testclient import TestClient
 
-from src.api.app import app, create_app
-
-
-@pytest.fixture
-def client() -> TestClient:
-    """Create test client."""
-    return TestClient(app)
+from src.api.app import create_app
 
 
 class TestAppCreation:
@@ -11,12 +11,6 @@ from src.api.app import app
 from src.api.middleware import RequestContextMiddleware, RequestLoggingMiddleware
 
 
-@pytest.fixture
-def client() -> TestClient:
-    """Create test client."""
-    return TestClient(app)
-
-
 class TestRequestContextMiddleware:
     """Test RequestContextMiddleware."""
 
@@ -1,5 +1,7 @@
 """Unit tests for Message Batches API models."""
 
+from typing import Any
+
 import pytest
 from pydantic import ValidationError
 
@@ -18,6 +20,42 @@ from src.models.batches import (
     SucceededResult,
 )
 
+pytestmark = pytest.mark.unit
+
+# Default-valued params for tests that don't exercise BatchRequestParams validation
+_EMPTY_PARAMS_KWARGS: dict[str, Any] = dict(
+    model="claude-sonnet-4-5",
+    messages=[],
+    max_tokens=4096,
+    system=None,
+    stop_sequences=None,
+    temperature=None,
+    top_p=None,
+    top_k=None,
+    tools=None,
+    tool_choice=None,
+    metadata=None,
+    thinking=None,
+)
+
+
+# Shared all-zero counts for read-only consumers; don't mutate
+_ZERO_COUNTS = RequestCounts()
+
+
+def _empty_params() -> BatchRequestParams:
+    """Build empty BatchRequestParams without re-running validation."""
+    return BatchRequestParams.model_construct(**_EMPTY_PARAMS_KWARGS)
+
+
+@pytest.fixture(scope="module")
+def many_requests() -> tuple[BatchRequest, ...]:
+    """101 prebuilt requests (one over the batch limit), sliced by the length tests."""
+    return tuple(
+        BatchRequest.model_construct(custom_id=f"req{i}", params=_empty_params())
+        for i in range(101)
+    )
+
 
 class TestBatchRequestParams:
     """Test BatchRequestParams model."""
@@ -106,38 +144,22 @@ class TestBatchRequest:
         assert request.custom_id == "my-request-1"
         assert request.params.model == "claude-sonnet-4-5"
 
-    def test_custom_id_min_length(self) -> None:
-        """Test custom_id minimum length validation."""
+    @pytest.mark.parametrize(
+        "custom_id",
+        ["", "x" * 65],  # empty string; 65 chars, max is 64
+        ids=["empty", "too_long"],
+    )
+    def test_custom_id_invalid(self, custom_id: str) -> None:
+        """Test custom_id min/max length validation."""
         with pytest.raises(ValidationError) as exc_info:
-            BatchRequest(
-                custom_id="",  # empty string
-                params=BatchRequestParams(
-                    model="claude-sonnet-4-5",
-                    messages=[],
-                ),
-            )
-        assert "custom_id" in str(exc_info.value).lower() or "string" in str(exc_info.value).lower()
-
-    def test_custom_id_max_length(self) -> None:
-        """Test custom_id maximum length validation."""
-        with pytest.raises(ValidationError) as exc_info:
-            BatchRequest(
-                custom_id="x" * 65,  # 65 chars, max is 64
-                params=BatchRequestParams(
-                    model="claude-sonnet-4-5",
-                    messages=[],
-                ),
-            )
+            BatchRequest(custom_id=custom_id, params=_empty_params())
         assert "custom_id" in str(exc_info.value).lower() or "string" in str(exc_info.value).lower()
 
     def test_custom_id_exact_max_length(self) -> None:
         """Test custom_id at exactly max length."""
         request = BatchRequest(
             custom_id="x" * 64,  # exactly 64 chars
-            params=BatchRequestParams(
-                model="claude-sonnet-4-5",
-                messages=[],
-            ),
+            params=_empty_params(),
         )
         assert len(request.custom_id) == 64
 
@@ -161,41 +183,17 @@ class TestCreateBatchRequest:
 
         assert len(request.requests) == 1
 
-    def test_requests_min_length(self) -> None:
-        """Test requests minimum length validation."""
+    @pytest.mark.parametrize("count", [0, 101], ids=["empty", "over_max"])
+    def test_requests_invalid_length(
+        self, count: int, many_requests: tuple[BatchRequest, ...]
+    ) -> None:
+        """Test requests min/max length validation (1..100)."""
         with pytest.raises(ValidationError):
-            CreateBatchRequest(requests=[])  # empty list
-
-    def test_requests_max_length(self) -> None:
-        """Test requests maximum length validation."""
-        requests = [
-            BatchRequest(
-                custom_id=f"req{i}",
-                params=BatchRequestParams(
-                    model="claude-sonnet-4-5",
-                    messages=[],
-                ),
-            )
-            for i in range(101)  # 101 requests, max is 100
-        ]
+            CreateBatchRequest(requests=list(many_requests[:count]))
 
-        with pytest.raises(ValidationError):
-            CreateBatchRequest(requests=requests)
-
-    def test_requests_at_max(self) -> None:
+    def test_requests_at_max(self, many_requests: tuple[BatchRequest, ...]) -> None:
         """Test requests at exactly max length."""
-        requests = [
-            BatchRequest(
-                custom_id=f"req{i}",
-                params=BatchRequestParams(
-                    model="claude-sonnet-4-5",
-                    messages=[],
-                ),
-            )
-            for i in range(100)  # exactly 100 requests
-        ]
-
-        batch = CreateBatchRequest(requests=requests)
+        batch = CreateBatchRequest(requests=list(many_requests[:100]))
         assert len(batch.requests) == 100
 
 
@@ -278,24 +276,24 @@ class TestMessageBatch:
         assert batch.cancel_initiated_at == "2024-01-15T12:02:00Z"
         assert batch.results_url == "https://example.com/results"
 
-    def test_processing_status_values(self) -> None:
+    @pytest.mark.parametrize("status", ["in_progress", "canceling", "ended"])
+    def test_processing_status_values(self, status: str) -> None:
         """Test valid processing status values."""
-        for status in ["in_progress", "canceling", "ended"]:
-            batch = MessageBatch(
-                id="msgbatch_test",
-                processing_status=status,  # type: ignore[arg-type]
-                request_counts=RequestCounts(),
-                created_at="2024-01-15T12:00:00Z",
-                expires_at="2024-02-13T12:00:00Z",
-            )
-            assert batch.processing_status == status
+        batch = MessageBatch(
+            id="msgbatch_test",
+            processing_status=status,  # type: ignore[arg-type]
+            request_counts=_ZERO_COUNTS,
+            created_at="2024-01-15T12:00:00Z",
+            expires_at="2024-02-13T12:00:00Z",
+        )
+        assert batch.processing_status == status
 
     def test_default_type(self) -> None:
         """Test default type is 'message_batch'."""
         batch = MessageBatch(
             id="msgbatch_test",
             processing_status="in_progress",
-            request_counts=RequestCounts(),
+            request_counts=_ZERO_COUNTS,
             created_at="2024-01-15T12:00:00Z",
             expires_at="2024-02-13T12:00:00Z",
         )
@@ -475,6 +473,17 @@ class TestBatchResultLine:
         assert line.custom_id == "req-4"
         assert line.result.type == "expired"
 
+    def test_validate_from_dict_uses_type_tag(self) -> None:
+        """Test raw result dicts resolve to the model named by their type tag."""
+        line = BatchResultLine.model_validate(
+            {"custom_id": "req-5", "result": {"type": "errored", "error": {"type": "api_error"}}}
+        )
+
+        assert isinstance(line.result, ErroredResult)
+
+        with pytest.raises(ValidationError):
+            BatchResultLine.model_validate({"custom_id": "req-6", "result": {"type": "unknown"}})
+
     def test_model_dump(self) -> None:
         """Test model serialization for JSONL output."""
         line = BatchResultLine(
@@ -487,10 +496,11 @@ class TestBatchResultLine:
         assert data["result"]["type"] == "succeeded"
         assert "message" in data["result"]
 
-    def test_required_fields(self) -> None:
+    @pytest.mark.parametrize("missing", ["result", "custom_id"])
+    def test_required_fields(self, missing: str) -> None:
         """Test required fields."""
-        with pytest.raises(ValidationError):
-            BatchResultLine(custom_id="test")  # type: ignore[call-arg]  # missing result
+        kwargs: dict[str, Any] = {"custom_id": "test", "result": CanceledResult()}
+        del kwargs[missing]
 
         with pytest.raises(ValidationError):
-            BatchResultLine(result=CanceledResult())  # type: ignore[call-arg]  # missing custom_id
+            BatchResultLine(**kwargs)
@@ -1,5 +1,8 @@
 """Unit tests for Files API models."""
 
+from types import MappingProxyType
+from typing import Any
+
 import pytest
 from pydantic import ValidationError
 
@@ -9,6 +12,19 @@ from src.models.files import (
     FilesListResponse,
 )
 
+pytestmark = pytest.mark.unit
+
+# Read-only kwargs for a minimal valid FileMetadata; copy before overriding keys
+_BASE_FILE_META: MappingProxyType[str, Any] = MappingProxyType(
+    {
+        "id": "file_123",
+        "filename": "test.txt",
+        "mime_type": "text/plain",
+        "size_bytes": 100,
+        "created_at": "2024-01-15T12:00:00Z",
+    }
+)
+
 
 class TestFileMetadata:
     """Test FileMetadata model."""
@@ -31,38 +47,19 @@ class TestFileMetadata:
 
     def test_default_type(self) -> None:
         """Test default type is 'file'."""
-        metadata = FileMetadata(
-            id="file_123",
-            filename="test.txt",
-            mime_type="text/plain",
-            size_bytes=100,
-            created_at="2024-01-15T12:00:00Z",
-        )
+        metadata = FileMetadata(**_BASE_FILE_META)
 
         assert metadata.type == "file"
 
     def test_default_downloadable(self) -> None:
         """Test default downloadable is True."""
-        metadata = FileMetadata(
-            id="file_123",
-            filename="test.txt",
-            mime_type="text/plain",
-            size_bytes=100,
-            created_at="2024-01-15T12:00:00Z",
-        )
+        metadata = FileMetadata(**_BASE_FILE_META)
 
         assert metadata.downloadable is True
 
     def test_explicit_downloadable_false(self) -> None:
         """Test explicitly setting downloadable to False."""
-        metadata = FileMetadata(
-            id="file_123",
-            filename="test.txt",
-            mime_type="text/plain",
-            size_bytes=100,
-            created_at="2024-01-15T12:00:00Z",
-            downloadable=False,
-        )
+        metadata = FileMetadata(**{**_BASE_FILE_META, "downloadable": False})
 
         assert metadata.downloadable is False
 
@@ -82,13 +79,14 @@ class TestFileMetadata:
         assert data["filename"] == "data.json"
         assert data["downloadable"] is True
 
-    def test_required_fields(self) -> None:
-        """Test that required fields must be provided."""
+    @pytest.mark.parametrize("missing", ["id", "filename", "mime_type", "size_bytes", "created_at"])
+    def test_required_fields(self, missing: str) -> None:
+        """Test that each required field must be provided."""
+        kwargs = dict(_BASE_FILE_META)
+        del kwargs[missing]
+
         with pytest.raises(ValidationError):
-            FileMetadata(  # type: ignore[call-arg]
-                id="file_123",
-                # missing filename, mime_type, size_bytes, created_at
-            )
+            FileMetadata(**kwargs)
 
     def test_large_size_bytes(self) -> None:
         """Test handling large file sizes."""
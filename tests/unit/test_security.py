@@ -1,117 +1,103 @@
 """Unit tests for API security module."""
 
-from unittest.mock import patch
-
 import pytest
 from fastapi import HTTPException
 
 from src.api.security import verify_api_key
+from src.core import settings
 
 
 class TestVerifyApiKey:
     """Test API key verification."""
 
     @pytest.mark.asyncio
-    async def test_no_auth_key_configured_allows_all(self) -> None:
+    async def test_no_auth_key_configured_allows_all(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test that requests are allowed when no auth key is configured."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = None
+        monkeypatch.setattr(settings, "auth_key", None)
 
-            # Should not raise
-            await verify_api_key(x_api_key=None, authorization=None)
-            await verify_api_key(x_api_key="any-key", authorization=None)
+        # Should not raise
+        await verify_api_key(x_api_key=None, authorization=None)
+        await verify_api_key(x_api_key="any-key", authorization=None)
 
     @pytest.mark.asyncio
-    async def test_empty_auth_key_allows_all(self) -> None:
+    async def test_empty_auth_key_allows_all(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test that empty auth key allows all requests."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = ""
+        monkeypatch.setattr(settings, "auth_key", "")
 
-            # Should not raise
-            await verify_api_key(x_api_key=None, authorization=None)
+        # Should not raise
+        await verify_api_key(x_api_key=None, authorization=None)
 
     @pytest.mark.asyncio
-    async def test_valid_x_api_key_header(self) -> None:
-        """Test valid x-api-key header passes."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = "secret-key-123"
-
-            # Should not raise
-            await verify_api_key(x_api_key="secret-key-123", authorization=None)
+    @pytest.mark.parametrize(
+        ("x_api_key", "authorization"),
+        [
+            ("secret-key-123", None),
+            (None, "Bearer secret-key-123"),
+            (None, "bearer secret-key-123"),
+            (None, "BEARER secret-key-123"),
+        ],
+        ids=["x_api_key", "bearer", "bearer_lower", "bearer_upper"],
+    )
+    async def test_valid_credentials(
+        self, monkeypatch: pytest.MonkeyPatch, x_api_key: str | None, authorization: str | None
+    ) -> None:
+        """Test a matching x-api-key or case-insensitive Bearer token passes."""
+        monkeypatch.setattr(settings, "auth_key", "secret-key-123")
+
+        # Should not raise
+        await verify_api_key(x_api_key=x_api_key, authorization=authorization)
 
     @pytest.mark.asyncio
-    async def test_valid_bearer_token(self) -> None:
-        """Test valid Bearer token passes."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = "secret-key-123"
-
-            # Should not raise
-            await verify_api_key(x_api_key=None, authorization="Bearer secret-key-123")
-
-    @pytest.mark.asyncio
-    async def test_bearer_case_insensitive(self) -> None:
-        """Test Bearer token prefix is case-insensitive."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = "secret-key-123"
-
-            # Should not raise with different cases
-            await verify_api_key(x_api_key=None, authorization="bearer secret-key-123")
-            await verify_api_key(x_api_key=None, authorization="BEARER secret-key-123")
-
-    @pytest.mark.asyncio
-    async def test_invalid_x_api_key_raises_401(self) -> None:
+    async def test_invalid_x_api_key_raises_401(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test invalid x-api-key raises 401."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = "secret-key-123"
+        monkeypatch.setattr(settings, "auth_key", "secret-key-123")
 
-            with pytest.raises(HTTPException) as exc_info:
-                await verify_api_key(x_api_key="wrong-key", authorization=None)
+        with pytest.raises(HTTPException) as exc_info:
+            await verify_api_key(x_api_key="wrong-key", authorization=None)
 
-            assert exc_info.value.status_code == 401
+        assert exc_info.value.status_code == 401
 
     @pytest.mark.asyncio
-    async def test_invalid_bearer_token_raises_401(self) -> None:
+    async def test_invalid_bearer_token_raises_401(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test invalid Bearer token raises 401."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = "secret-key-123"
+        monkeypatch.setattr(settings, "auth_key", "secret-key-123")
 
-            with pytest.raises(HTTPException) as exc_info:
-                await verify_api_key(x_api_key=None, authorization="Bearer wrong-key")
+        with pytest.raises(HTTPException) as exc_info:
+            await verify_api_key(x_api_key=None, authorization="Bearer wrong-key")
 
-            assert exc_info.value.status_code == 401
+        assert exc_info.value.status_code == 401
 
     @pytest.mark.asyncio
-    async def test_missing_key_when_required_raises_401(self) -> None:
+    async def test_missing_key_when_required_raises_401(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test missing key when auth required raises 401."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = "secret-key-123"
+        monkeypatch.setattr(settings, "auth_key", "secret-key-123")
 
-            with pytest.raises(HTTPException) as exc_info:
-                await verify_api_key(x_api_key=None, authorization=None)
+        with pytest.raises(HTTPException) as exc_info:
+            await verify_api_key(x_api_key=None, authorization=None)
 
-            assert exc_info.value.status_code == 401
-            assert exc_info.value.headers is not None
-            assert "WWW-Authenticate" in exc_info.value.headers
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.headers is not None
+        assert "WWW-Authenticate" in exc_info.value.headers
 
     @pytest.mark.asyncio
-    async def test_malformed_authorization_header(self) -> None:
+    async def test_malformed_authorization_header(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test malformed Authorization header raises 401."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = "secret-key-123"
+        monkeypatch.setattr(settings, "auth_key", "secret-key-123")
 
-            # No space separator
-            with pytest.raises(HTTPException):
-                await verify_api_key(x_api_key=None, authorization="Bearersecret-key-123")
+        # No space separator
+        with pytest.raises(HTTPException):
+            await verify_api_key(x_api_key=None, authorization="Bearersecret-key-123")
 
-            # Wrong scheme
-            with pytest.raises(HTTPException):
-                await verify_api_key(x_api_key=None, authorization="Basic secret-key-123")
+        # Wrong scheme
+        with pytest.raises(HTTPException):
+            await verify_api_key(x_api_key=None, authorization="Basic secret-key-123")
 
     @pytest.mark.asyncio
-    async def test_x_api_key_takes_precedence(self) -> None:
+    async def test_x_api_key_takes_precedence(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test x-api-key header is checked before Authorization."""
-        with patch("src.api.security.settings") as mock_settings:
-            mock_settings.auth_key = "secret-key-123"
+        monkeypatch.setattr(settings, "auth_key", "secret-key-123")
 
-            # Valid x-api-key with invalid Authorization should pass
-            await verify_api_key(x_api_key="secret-key-123", authorization="Bearer wrong-key")
+        # Valid x-api-key with invalid Authorization should pass
+        await verify_api_key(x_api_key="secret-key-123", authorization="Bearer wrong-key")
@@ -1,6 +1,7 @@
 """Unit tests for session pool module."""
 
 import asyncio
+from collections.abc import Generator
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -14,27 +15,57 @@ from src.sdk.session_pool import (
     shutdown_pool,
 )
 
+# Opaque placeholders for PooledSession tests that never touch the client
+_STUB_CLIENT = MagicMock(name="stub_client")
+_STUB_OPTIONS = MagicMock(name="stub_options")
+
+
+class _StubClient:
+    """Bare awaitable stand-in for ClaudeSDKClient when no call history is needed."""
+
+    def __init__(self, options: object = None) -> None:
+        self.options = options
+
+    async def __aenter__(self) -> "_StubClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> bool:
+        return False
+
+    async def clear(self) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_sdk_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make the pool build _StubClient instances instead of real SDK clients."""
+    monkeypatch.setattr("src.sdk.session_pool.ClaudeSDKClient", _StubClient)
+
+
+@pytest.fixture
+def mock_sdk_client(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Make every ClaudeSDKClient the pool creates return one AsyncMock."""
+    client = AsyncMock()
+    monkeypatch.setattr("src.sdk.session_pool.ClaudeSDKClient", lambda *a, **kw: client)
+    return client
+
 
 class TestPooledSession:
     """Test PooledSession dataclass."""
 
     def test_creation(self) -> None:
         """Test PooledSession creation with defaults."""
-        client = MagicMock()
-        options = MagicMock()
-        session = PooledSession(id="test_1", client=client, options=options)
+        session = PooledSession(id="test_1", client=_STUB_CLIENT, options=_STUB_OPTIONS)
 
         assert session.id == "test_1"
-        assert session.client is client
-        assert session.options is options
+        assert session.client is _STUB_CLIENT
+        assert session.options is _STUB_OPTIONS
         assert session.is_active is False
         assert session.use_count == 0
 
     def test_age_seconds(self) -> None:
         """Test age_seconds property."""
-        client = MagicMock()
-        options = MagicMock()
-        session = PooledSession(id="test_1", client=client, options=options)
+        session = PooledSession(id="test_1", client=_STUB_CLIENT, options=_STUB_OPTIONS)
 
         # Age should be close to 0
         assert session.age_seconds >= 0
@@ -42,9 +73,7 @@ class TestPooledSession:
 
     def test_idle_seconds(self) -> None:
         """Test idle_seconds property."""
-        client = MagicMock()
-        options = MagicMock()
-        session = PooledSession(id="test_1", client=client, options=options)
+        session = PooledSession(id="test_1", client=_STUB_CLIENT, options=_STUB_OPTIONS)
 
         # Idle should be close to 0
         assert session.idle_seconds >= 0
@@ -52,17 +81,13 @@ class TestPooledSession:
 
     def test_is_expired_false(self) -> None:
         """Test is_expired returns False for fresh session."""
-        client = MagicMock()
-        options = MagicMock()
-        session = PooledSession(id="test_1", client=client, options=options)
+        session = PooledSession(id="test_1", client=_STUB_CLIENT, options=_STUB_OPTIONS)
 
         assert session.is_expired(ttl_seconds=60) is False
 
     def test_is_expired_true(self) -> None:
         """Test is_expired returns True for old session."""
-        client = MagicMock()
-        options = MagicMock()
-        session = PooledSession(id="test_1", client=client, options=options)
+        session = PooledSession(id="test_1", client=_STUB_CLIENT, options=_STUB_OPTIONS)
 
         # Manually set last_activity to the past
         session.last_activity = datetime.now() - timedelta(seconds=120)
@@ -75,7 +100,11 @@ class TestSessionPool:
 
     @pytest.fixture
     def pool(self) -> SessionPool:
-        """Create a test pool."""
+        """Create a test pool.
+
+        Left unstarted: acquire() works without the background cleanup task,
+        so only the lifecycle tests call start().
+        """
         return SessionPool(max_sessions=5, ttl_seconds=60, cleanup_interval_seconds=30)
 
     def test_initialization(self, pool: SessionPool) -> None:
@@ -111,8 +140,7 @@ class TestSessionPool:
 
         await pool.stop()
 
-    @pytest.mark.asyncio
-    async def test_generate_session_id(self, pool: SessionPool) -> None:
+    def test_generate_session_id(self, pool: SessionPool) -> None:
         """Test session ID generation."""
         id1 = pool._generate_session_id()
         id2 = pool._generate_session_id()
@@ -122,126 +150,100 @@ class TestSessionPool:
         assert id2.startswith("pool_session_")
 
     @pytest.mark.asyncio
+    @pytest.mark.usefixtures("stub_sdk_client")
     async def test_acquire_creates_session(self, pool: SessionPool) -> None:
         """Test acquiring creates a new session."""
-        with patch("src.sdk.session_pool.ClaudeSDKClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        async with pool.acquire() as session:
+            assert session is not None
+            assert session.is_active is True
+            assert session.use_count == 1
 
-            await pool.start()
-
-            async with pool.acquire() as session:
-                assert session is not None
-                assert session.is_active is True
-                assert session.use_count == 1
-
-            await pool.stop()
+        await pool.stop()
 
     @pytest.mark.asyncio
+    @pytest.mark.usefixtures("stub_sdk_client")
     async def test_acquire_reuses_session(self, pool: SessionPool) -> None:
         """Test acquiring reuses available session."""
-        with patch("src.sdk.session_pool.ClaudeSDKClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-
-            await pool.start()
-
-            # First acquire
-            async with pool.acquire() as session1:
-                session_id = session1.id
+        # First acquire
+        async with pool.acquire() as session1:
+            session_id = session1.id
 
-            # Second acquire should reuse
-            async with pool.acquire() as session2:
-                assert session2.id == session_id
-                assert session2.use_count == 2
+        # Second acquire should reuse
+        async with pool.acquire() as session2:
+            assert session2.id == session_id
+            assert session2.use_count == 2
 
-            await pool.stop()
+        await pool.stop()
 
     @pytest.mark.asyncio
-    async def test_release_clears_session(self, pool: SessionPool) -> None:
+    async def test_release_clears_session(
+        self, pool: SessionPool, mock_sdk_client: AsyncMock
+    ) -> None:
         """Test releasing clears session context."""
-        with patch("src.sdk.session_pool.ClaudeSDKClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.clear = AsyncMock()
-            mock_client_class.return_value = mock_client
+        mock_sdk_client.clear = AsyncMock()
 
-            await pool.start()
+        async with pool.acquire() as _session:
+            pass
 
-            async with pool.acquire() as _session:
-                pass
+        # Session should have been cleared
+        mock_sdk_client.clear.assert_called()
 
-            # Session should have been cleared
-            mock_client.clear.assert_called()
-
-            await pool.stop()
+        await pool.stop()
 
     @pytest.mark.asyncio
-    async def test_release_with_reset_method(self, pool: SessionPool) -> None:
+    async def test_release_with_reset_method(
+        self, pool: SessionPool, mock_sdk_client: AsyncMock
+    ) -> None:
         """Test releasing with reset method instead of clear."""
-        with patch("src.sdk.session_pool.ClaudeSDKClient") as mock_client_class:
-            mock_client = AsyncMock()
-            # No clear, but has reset
-            del mock_client.clear
-            mock_client.reset = AsyncMock()
-            mock_client_class.return_value = mock_client
+        # No clear, but has reset
+        del mock_sdk_client.clear
+        mock_sdk_client.reset = AsyncMock()
 
-            await pool.start()
+        async with pool.acquire() as _:
+            pass
 
-            async with pool.acquire() as _:
-                pass
-
-            mock_client.reset.assert_called()
+        mock_sdk_client.reset.assert_called()
 
-            await pool.stop()
+        await pool.stop()
 
     @pytest.mark.asyncio
+    @pytest.mark.usefixtures("stub_sdk_client")
     async def test_get_stats(self, pool: SessionPool) -> None:
         """Test getting pool stats."""
-        with patch("src.sdk.session_pool.ClaudeSDKClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-
-            await pool.start()
-
-            async with pool.acquire() as _:
-                stats = await pool.get_stats()
+        async with pool.acquire() as _:
+            stats = await pool.get_stats()
 
-                assert stats["max_sessions"] == 5
-                assert stats["ttl_seconds"] == 60
-                assert stats["total_sessions"] == 1
-                assert stats["active_sessions"] == 1
-                assert "sessions" in stats
+            assert stats["max_sessions"] == 5
+            assert stats["ttl_seconds"] == 60
+            assert stats["total_sessions"] == 1
+            assert stats["active_sessions"] == 1
+            assert "sessions" in stats
 
-            await pool.stop()
+        await pool.stop()
 
     @pytest.mark.asyncio
+    @pytest.mark.usefixtures("stub_sdk_client")
     async def test_cleanup_expired_sessions(self, pool: SessionPool) -> None:
         """Test cleanup removes expired sessions."""
-        with patch("src.sdk.session_pool.ClaudeSDKClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-
-            # Use short TTL for testing
-            pool._ttl_seconds = 1
+        # Use short TTL for testing
+        pool._ttl_seconds = 1
 
-            await pool.start()
+        async with pool.acquire() as session:
+            session_id = session.id
 
-            async with pool.acquire() as session:
-                session_id = session.id
+        # Session is now available
+        assert pool.total_sessions == 1
 
-            # Session is now available
-            assert pool.total_sessions == 1
-
-            # Wait for expiration
-            await asyncio.sleep(1.5)
-
-            # Run cleanup
-            await pool._cleanup_expired()
+        # Back-date the idle session past the TTL and run cleanup
+        pool._sessions[session_id].last_activity = datetime.now() - timedelta(
+            seconds=pool._ttl_seconds + 1
+        )
+        await pool._cleanup_expired()
 
-            # Session should be removed
-            assert session_id not in pool._sessions
+        # Session should be removed
+        assert session_id not in pool._sessions
 
-            await pool.stop()
+        await pool.stop()
 
     @pytest.mark.asyncio
     async def test_close_session_handles_error(self, pool: SessionPool) -> None:
@@ -264,14 +266,11 @@ class TestPooledSessionProperties:
 
     def test_age_calculation(self) -> None:
         """Test age is calculated correctly."""
-        client = MagicMock()
-        options = MagicMock()
-
         # Create session with old created_at
         session = PooledSession(
             id="test_1",
-            client=client,
-            options=options,
+            client=_STUB_CLIENT,
+            options=_STUB_OPTIONS,
             created_at=datetime.now() - timedelta(seconds=30),
         )
 
@@ -279,13 +278,10 @@ class TestPooledSessionProperties:
 
     def test_idle_calculation(self) -> None:
         """Test idle time is calculated correctly."""
-        client = MagicMock()
-        options = MagicMock()
-
         session = PooledSession(
             id="test_1",
-            client=client,
-            options=options,
+            client=_STUB_CLIENT,
+            options=_STUB_OPTIONS,
             last_activity=datetime.now() - timedelta(seconds=15),
         )
 
@@ -314,36 +310,45 @@ class TestGlobalPoolFunctions:
         pool2 = get_pool()
         assert pool1 is pool2
 
+    @pytest.fixture
+    def patched_lifecycle(self) -> Generator[tuple[AsyncMock, AsyncMock], None, None]:
+        """Patch SessionPool.start and SessionPool.stop and yield both mocks."""
+        with (
+            patch.object(SessionPool, "start", new_callable=AsyncMock) as mock_start,
+            patch.object(SessionPool, "stop", new_callable=AsyncMock) as mock_stop,
+        ):
+            yield mock_start, mock_stop
+
     @pytest.mark.asyncio
-    async def test_init_pool(self) -> None:
+    async def test_init_pool(self, patched_lifecycle: tuple[AsyncMock, AsyncMock]) -> None:
         """Test init_pool starts the pool."""
-        with patch.object(SessionPool, "start", new_callable=AsyncMock) as mock_start:
-            pool = await init_pool()
-            mock_start.assert_called_once()
-            assert pool is not None
+        mock_start, _ = patched_lifecycle
+
+        pool = await init_pool()
+        mock_start.assert_called_once()
+        assert pool is get_pool()
 
     @pytest.mark.asyncio
-    async def test_shutdown_pool(self) -> None:
+    async def test_shutdown_pool(self, patched_lifecycle: tuple[AsyncMock, AsyncMock]) -> None:
         """Test shutdown_pool stops and clears the pool."""
         import src.sdk.session_pool as sp
 
-        # Create and start pool
-        pool = get_pool()
-        with patch.object(pool, "start", new_callable=AsyncMock):
-            await init_pool()
+        _, mock_stop = patched_lifecycle
 
-        with patch.object(pool, "stop", new_callable=AsyncMock) as mock_stop:
-            await shutdown_pool()
-            mock_stop.assert_called_once()
-            assert sp._pool is None
+        await init_pool()
+        await shutdown_pool()
+        mock_stop.assert_called_once()
+        assert sp._pool is None
 
     @pytest.mark.asyncio
-    async def test_shutdown_pool_when_none(self) -> None:
+    async def test_shutdown_pool_when_none(
+        self, patched_lifecycle: tuple[AsyncMock, AsyncMock]
+    ) -> None:
         """Test shutdown_pool handles None pool."""
-        import src.sdk.session_pool as sp
+        _, mock_stop = patched_lifecycle
 
-        sp._pool = None
         await shutdown_pool()  # Should not raise
+        mock_stop.assert_not_called()
 
 
 class TestSessionPoolEdgeCases:
@@ -369,8 +374,6 @@ class TestSessionPoolEdgeCases:
             mock_client.__aexit__ = AsyncMock()
             mock_client_class.return_value = mock_client
 
-            await pool.start()
-
             async with pool.acquire() as _:
                 pass
 
@@ -393,8 +396,6 @@ class TestSessionPoolEdgeCases:
             mock_client.__aexit__ = AsyncMock()
             mock_client_class.return_value = mock_client
 
-            await pool.start()
-
             # Should not raise, just log warning
             async with pool.acquire() as _:
                 pass
@@ -402,58 +403,57 @@ class TestSessionPoolEdgeCases:
             await pool.stop()
 
     @pytest.mark.asyncio
-    async def test_release_error_closes_session(self) -> None:
+    async def test_release_error_closes_session(self, mock_sdk_client: AsyncMock) -> None:
         """Test that release error closes the session."""
         pool = SessionPool(max_sessions=5, ttl_seconds=60, cleanup_interval_seconds=30)
 
-        with patch("src.sdk.session_pool.ClaudeSDKClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.clear = AsyncMock(side_effect=RuntimeError("Clear failed"))
-            mock_client_class.return_value = mock_client
-
-            await pool.start()
+        mock_sdk_client.clear = AsyncMock(side_effect=RuntimeError("Clear failed"))
 
-            async with pool.acquire() as session:
-                session_id = session.id
+        async with pool.acquire() as session:
+            session_id = session.id
 
-            # Session should be removed after error
-            assert session_id not in pool._sessions
+        # Session should be removed after error
+        assert session_id not in pool._sessions
 
-            await pool.stop()
+        await pool.stop()
 
     @pytest.mark.asyncio
     async def test_cleanup_loop_handles_error(self) -> None:
         """Test cleanup loop continues after error."""
         pool = SessionPool(max_sessions=5, ttl_seconds=60, cleanup_interval_seconds=1)
+        pool._running = True
 
-        with patch.object(pool, "_cleanup_expired", side_effect=RuntimeError("Cleanup error")):
-            await pool.start()
-            await asyncio.sleep(0.3)  # Let cleanup run a few times
-            await pool.stop()
+        # Two ticks that fail, then a cancel to end the loop
+        sleep = AsyncMock(side_effect=[None, None, asyncio.CancelledError()])
+        with (
+            patch.object(
+                pool, "_cleanup_expired", side_effect=RuntimeError("Cleanup error")
+            ) as cleanup,
+            patch.object(asyncio, "sleep", sleep),
+        ):
+            await pool._cleanup_loop()
 
-        # Pool should still be functional
-        assert True  # If we get here, it didn't crash
+        assert cleanup.await_count == 2
+        assert sleep.await_count == 3
 
     @pytest.mark.asyncio
+    @pytest.mark.usefixtures("stub_sdk_client")
     async def test_close_all_sessions(self) -> None:
         """Test closing all sessions."""
         pool = SessionPool(max_sessions=5, ttl_seconds=60, cleanup_interval_seconds=30)
 
-        with patch("src.sdk.session_pool.ClaudeSDKClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-
-            await pool.start()
-
-            # Create multiple sessions
+        async def hold_session() -> None:
             async with pool.acquire() as _:
-                async with pool.acquire() as _:
-                    pass
+                # Yield while holding the session so the other caller can't reuse it
+                await asyncio.sleep(0)
 
-            assert pool.total_sessions == 2
+        # Create multiple sessions
+        await asyncio.gather(hold_session(), hold_session())
 
-            await pool._close_all_sessions()
+        assert pool.total_sessions == 2
 
-            assert pool.total_sessions == 0
+        await pool._close_all_sessions()
 
-            await pool.stop()
+        assert pool.total_sessions == 0
+
+        await pool.stop()
@@ -1,12 +1,20 @@
 """Unit tests for streaming response utilities."""
 
 import logging
+from collections.abc import Iterator
+from logging.handlers import QueueHandler
 from typing import AsyncIterator
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.api.streaming import StreamingResponseWithLogging, wrap_stream_with_logging
+from src.api import streaming as streaming_module
+from src.api.streaming import (
+    StreamingResponseWithLogging,
+    start_log_listener,
+    stop_log_listener,
+    wrap_stream_with_logging,
+)
 from src.core.context import RequestContext
 
 
@@ -26,18 +34,15 @@ class TestStreamingResponseWithLogging:
         assert response.status_code == 200
         assert response.media_type == "text/event-stream"
 
-    def test_init_without_context(self) -> None:
+    def test_init_without_context(self, mock_request_ctx: MagicMock) -> None:
         """Test initialization without context uses get_context."""
 
         async def dummy_stream() -> AsyncIterator[bytes]:
             yield b"test"
 
-        with patch("src.api.streaming.get_context") as mock_get:
-            mock_ctx = MagicMock(spec=RequestContext)
-            mock_get.return_value = mock_ctx
-
+        with patch("src.api.streaming.get_context", return_value=mock_request_ctx):
             response = StreamingResponseWithLogging(content=dummy_stream())
-            assert response._context is mock_ctx
+            assert response._context is mock_request_ctx
 
     def test_init_custom_status_and_headers(self) -> None:
         """Test initialization with custom status code and headers."""
@@ -167,6 +172,20 @@ class TestStreamingResponseWithLogging:
         assert "status=success" in caplog.text
         assert "bytes=100" in caplog.text
 
+    def test_log_completion_skipped_when_level_disabled(self) -> None:
+        """Test nothing is built or logged when the level is filtered out."""
+        response = StreamingResponseWithLogging(content=_empty_stream(), context=None)
+
+        with (
+            patch.object(streaming_module.logger, "isEnabledFor", return_value=False),
+            patch.object(streaming_module.logger, "log") as mock_log,
+        ):
+            response._log_completion(
+                bytes_sent=100, chunks_sent=5, duration=0.5, error=None, disconnect=False
+            )
+
+        mock_log.assert_not_called()
+
     def test_log_completion_error(self, caplog: pytest.LogCaptureFixture) -> None:
         """Test logging on error."""
         ctx = RequestContext(request_id="req_456", path="/test", method="POST")
@@ -257,16 +276,15 @@ class TestWrapStreamWithLogging:
         assert chunks == [b"hello"]
 
     @pytest.mark.asyncio
-    async def test_uses_get_context_when_none(self) -> None:
+    async def test_uses_get_context_when_none(self, mock_request_ctx: MagicMock) -> None:
         """Test that get_context is used when context is None."""
 
         async def test_stream() -> AsyncIterator[bytes]:
             yield b"data"
 
-        mock_ctx = MagicMock(spec=RequestContext)
-        mock_ctx.request_id = "req_auto"
+        mock_request_ctx.request_id = "req_auto"
 
-        with patch("src.api.streaming.get_context", return_value=mock_ctx):
+        with patch("src.api.streaming.get_context", return_value=mock_request_ctx):
             with patch("src.api.streaming.record_stream_completion"):
                 async for _ in wrap_stream_with_logging(test_stream()):
                     pass
@@ -336,3 +354,77 @@ class TestWrapStreamWithLogging:
 
         assert "stream_completed" in caplog.text
         assert "req_log" in caplog.text
+
+
+async def _empty_stream() -> AsyncIterator[bytes]:
+    return
+    yield b""
+
+
+class TestLogListener:
+    """Test the background listener for stream completion logs."""
+
+    @pytest.fixture
+    def capture(self) -> Iterator[logging.Handler]:
+        """Yield a handler that records what it receives, stopping the listener after."""
+        handler = MagicMock(spec=logging.Handler)
+        handler.level = logging.NOTSET
+        yield handler
+        stop_log_listener()
+
+    def test_routes_records_through_listener(
+        self, capture: MagicMock, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test completion logs reach the listener's handlers, not the root logger."""
+        start_log_listener(capture)
+        assert streaming_module.logger.propagate is False
+
+        response = StreamingResponseWithLogging(content=_empty_stream(), context=None)
+        with caplog.at_level(logging.INFO, logger=streaming_module.__name__):
+            response._log_completion(
+                bytes_sent=1, chunks_sent=1, duration=0.1, error=None, disconnect=False
+            )
+        stop_log_listener()
+
+        assert streaming_module.logger.propagate is True
+        record = capture.handle.call_args[0][0]
+        assert "stream_completed" in record.getMessage()
+
+    def test_default_target_reaches_handlers_added_later(self, capture: MagicMock) -> None:
+        """Test the default listener feeds root handlers added after it starts."""
+        root = logging.getLogger()
+        start_log_listener()
+        root.addHandler(capture)
+        try:
+            streaming_module.logger.warning("stream_completed status=error")
+            # Stopping drains the queue
+            stop_log_listener()
+        finally:
+            root.removeHandler(capture)
+
+        assert capture.handle.call_args[0][0].getMessage() == "stream_completed status=error"
+
+    def test_full_queue_emits_synchronously(self, capture: MagicMock) -> None:
+        """Test records are emitted inline instead of dropped when the queue is full."""
+        with patch.object(streaming_module, "LOG_QUEUE_MAXSIZE", 1):
+            start_log_listener(capture)
+        # Stop draining so the queue stays full
+        listener = streaming_module._log_listener
+        assert listener is not None
+        listener.stop()
+        listener.queue.put_nowait(logging.makeLogRecord({"msg": "filler", "levelno": logging.INFO}))
+
+        streaming_module.logger.warning("overflow")
+
+        assert capture.handle.call_args[0][0].getMessage() == "overflow"
+        listener.start()
+
+    def test_start_is_idempotent(self, capture: MagicMock) -> None:
+        """Test starting twice keeps a single queue handler."""
+        start_log_listener(capture)
+        start_log_listener(capture)
+
+        queue_handlers = [
+            h for h in streaming_module.logger.handlers if isinstance(h, QueueHandler)
+        ]
+        assert len(queue_handlers) == 1
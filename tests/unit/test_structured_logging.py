@@ -2,7 +2,11 @@
 
 import json
 import logging
+from collections.abc import Iterator
 from io import StringIO
+from unittest.mock import patch
+
+import pytest
 
 from src.core.structured_logging import (
     STRUCTLOG_AVAILABLE,
@@ -99,6 +103,28 @@ class TestJSONFormatter:
         assert "ValueError" in data["exception"]
         assert "Test exception" in data["exception"]
 
+    def test_exception_text_is_formatted_once(self) -> None:
+        """Test the traceback cached on the record is reused across formatters."""
+        try:
+            raise ValueError("Test exception")
+        except ValueError:
+            import sys
+
+            exc_info = sys.exc_info()
+
+        record = logging.makeLogRecord({"msg": "An error occurred", "exc_info": exc_info})
+
+        first = JSONFormatter()
+        second = JSONFormatter()
+        with patch.object(
+            JSONFormatter, "formatException", return_value="cached traceback"
+        ) as mock_format:
+            first.format(record)
+            data = json.loads(second.format(record))
+
+        mock_format.assert_called_once()
+        assert data["exception"] == "cached traceback"
+
     def test_timestamp_is_iso_format(self) -> None:
         """Test timestamp is in ISO format."""
         formatter = JSONFormatter()
@@ -122,6 +148,75 @@ class TestJSONFormatter:
 
         datetime.fromisoformat(data["timestamp"].replace("Z", "+00:00"))
 
+    def test_timestamp_matches_record_created(self) -> None:
+        """Test timestamp reflects when the record was created, in UTC."""
+        from datetime import datetime, timezone
+
+        formatter = JSONFormatter()
+        record = logging.makeLogRecord({"msg": "Test message"})
+        record.created = 1735732800.25
+
+        data = json.loads(formatter.format(record))
+        # Same second again exercises the cached prefix
+        record.created = 1735732800.5
+        again = json.loads(formatter.format(record))
+
+        assert datetime.fromisoformat(data["timestamp"]) == datetime(
+            2025, 1, 1, 12, 0, 0, 250000, tzinfo=timezone.utc
+        )
+        assert again["timestamp"] == "2025-01-01T12:00:00.500000+00:00"
+
+    def test_fast_path_matches_dict_encoding(self) -> None:
+        """Test records without extras render exactly as the formatter's full encoding."""
+        formatter = JSONFormatter()
+        record = logging.LogRecord(
+            name='test "logger"',
+            level=logging.INFO,
+            pathname="/path/to/file.py",
+            lineno=42,
+            msg='Quote " newline \n unicode \u00e9',
+            args=(),
+            exc_info=None,
+        )
+
+        result = formatter.format(record)
+        data = json.loads(result)
+        # An extra field sends the same record down the dict encoding path
+        record.extra = {"k": 1}
+        full = formatter.format(record)
+
+        assert data["logger"] == 'test "logger"'
+        assert data["message"] == 'Quote " newline \n unicode \u00e9'
+        assert full == result[:-1] + ',"k":1}'
+
+    def test_non_string_message_without_args(self) -> None:
+        """Test a non-string msg is still converted when there are no args."""
+        formatter = JSONFormatter()
+        record = logging.makeLogRecord({"name": "test_logger", "msg": ValueError("boom")})
+
+        data = json.loads(formatter.format(record))
+
+        assert data["message"] == "boom"
+
+    def test_extra_fields_are_included(self) -> None:
+        """Test a record carrying an extra dict takes the full encoding path."""
+        formatter = JSONFormatter()
+        record = logging.LogRecord(
+            name="test_logger",
+            level=logging.INFO,
+            pathname="/path/to/file.py",
+            lineno=42,
+            msg="Test message",
+            args=(),
+            exc_info=None,
+        )
+        record.extra = {"request_id": "req_123"}
+
+        data = json.loads(formatter.format(record))
+
+        assert data["message"] == "Test message"
+        assert data["request_id"] == "req_123"
+
     def test_level_is_lowercase(self) -> None:
         """Test that level is lowercase."""
         formatter = JSONFormatter()
@@ -148,6 +243,15 @@ class TestJSONFormatter:
 
             assert data["level"] == data["level"].lower()
 
+    def test_custom_level_name_is_lowercased(self) -> None:
+        """Test levels outside the standard set fall back to the lowercased name."""
+        formatter = JSONFormatter()
+        record = logging.makeLogRecord({"msg": "Test", "levelno": 25, "levelname": "NOTICE"})
+
+        data = json.loads(formatter.format(record))
+
+        assert data["level"] == "notice"
+
 
 class TestConfigureStructuredLogging:
     """Test configure_structured_logging function."""
@@ -199,10 +303,21 @@ class TestGetLogger:
         assert logger1 is not None
         assert logger2 is not None
 
+    def test_same_name_returns_cached_logger(self) -> None:
+        """Test repeated calls with one name reuse the same logger."""
+        assert get_logger("module1") is get_logger("module1")
+
 
 class TestBindContext:
     """Test bind_context function."""
 
+    @pytest.fixture(autouse=True)
+    def _clean_context(self) -> Iterator[None]:
+        """Start and end every test with nothing bound."""
+        clear_context()
+        yield
+        clear_context()
+
     def test_bind_context_no_crash(self) -> None:
         """Test bind_context doesn't crash."""
         # Should work whether structlog is available or not
@@ -216,6 +331,19 @@ class TestBindContext:
             key3=123,
         )
 
+    @pytest.mark.skipif(not STRUCTLOG_AVAILABLE, reason="structlog not installed")
+    def test_bind_context_sets_contextvars(self) -> None:
+        """Test bound values are visible to structlog and removed by clear_context."""
+        import structlog
+
+        bind_context(request_id="req_bound")
+        try:
+            assert structlog.contextvars.get_contextvars()["request_id"] == "req_bound"
+        finally:
+            clear_context()
+
+        assert "request_id" not in structlog.contextvars.get_contextvars()
+
 
 class TestClearContext:
     """Test clear_context function."""
@@ -1,5 +1,11 @@
 """Unit tests for token counting module."""
 
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.sdk import tokenizer
 from src.sdk.tokenizer import (
     TIKTOKEN_AVAILABLE,
     count_content_block_tokens,
@@ -10,6 +16,21 @@ from src.sdk.tokenizer import (
     count_tool_definition_tokens,
 )
 
+_LONG_TEXT = "The quick brown fox jumps over the lazy dog. " * 100
+
+# Shared, read-only inputs; the count_* functions never mutate them
+_HELLO_MESSAGES: list[dict[str, Any]] = [{"role": "user", "content": "Hello"}]
+
+_WEATHER_TOOL: dict[str, Any] = {
+    "name": "get_weather",
+    "description": "Get the current weather for a location",
+    "input_schema": {
+        "type": "object",
+        "properties": {"location": {"type": "string"}},
+        "required": ["location"],
+    },
+}
+
 
 class TestCountTokens:
     """Test the count_tokens function."""
@@ -32,8 +53,7 @@ class TestCountTokens:
 
     def test_count_tokens_long_text(self) -> None:
         """Test counting tokens in long text."""
-        long_text = "The quick brown fox jumps over the lazy dog. " * 100
-        result = count_tokens(long_text)
+        result = count_tokens(_LONG_TEXT)
         assert result > 100  # Should be many tokens
 
     def test_count_tokens_returns_int(self) -> None:
@@ -45,96 +65,67 @@ class TestCountTokens:
 class TestCountContentBlockTokens:
     """Test the count_content_block_tokens function."""
 
-    def test_text_block(self) -> None:
-        """Test counting tokens in a text content block."""
-        block = {"type": "text", "text": "Hello, Claude!"}
-        result = count_content_block_tokens(block)
-        assert result > 0
-
-    def test_text_block_empty(self) -> None:
-        """Test counting tokens in empty text block."""
-        block = {"type": "text", "text": ""}
-        result = count_content_block_tokens(block)
-        assert result == 0
-
-    def test_text_block_missing_text_key(self) -> None:
-        """Test text block without text key defaults to empty."""
-        block = {"type": "text"}
-        result = count_content_block_tokens(block)
-        assert result == 0
-
-    def test_image_block(self) -> None:
-        """Test image block returns fixed 1000 tokens."""
-        block = {"type": "image", "source": {"type": "base64", "data": "..."}}
-        result = count_content_block_tokens(block)
-        assert result == 1000
-
-    def test_document_block_with_data(self) -> None:
-        """Test document block with base64 data."""
-        # 120 chars of data should be ~20 tokens (120/6)
-        block = {"type": "document", "source": {"type": "base64", "data": "A" * 120}}
-        result = count_content_block_tokens(block)
-        assert result == 20
-
-    def test_document_block_without_data(self) -> None:
-        """Test document block without data defaults to 1500."""
-        block = {"type": "document", "source": {}}
-        result = count_content_block_tokens(block)
-        assert result == 1500
-
-    def test_document_block_empty_data(self) -> None:
-        """Test document block with empty data defaults to 1500."""
-        block = {"type": "document", "source": {"data": ""}}
-        result = count_content_block_tokens(block)
-        assert result == 1500
-
-    def test_tool_use_block(self) -> None:
-        """Test counting tokens in tool_use block."""
-        block = {"type": "tool_use", "name": "get_weather", "input": {"location": "London"}}
-        result = count_content_block_tokens(block)
-        assert result > 0
-
-    def test_tool_use_block_empty_input(self) -> None:
-        """Test tool_use block with empty input."""
-        block = {"type": "tool_use", "name": "simple_tool", "input": {}}
-        result = count_content_block_tokens(block)
-        assert result > 0  # At least the tool name tokens
-
-    def test_tool_result_block_string_content(self) -> None:
-        """Test tool_result block with string content."""
-        block = {"type": "tool_result", "content": "The weather in London is sunny."}
-        result = count_content_block_tokens(block)
-        assert result > 0
-
-    def test_tool_result_block_list_content(self) -> None:
-        """Test tool_result block with list of blocks."""
-        block = {
-            "type": "tool_result",
-            "content": [
-                {"type": "text", "text": "Result part 1"},
-                {"type": "text", "text": "Result part 2"},
-            ],
-        }
-        result = count_content_block_tokens(block)
-        assert result > 0
-
-    def test_tool_result_block_empty_content(self) -> None:
-        """Test tool_result block with empty content."""
-        block = {"type": "tool_result", "content": ""}
-        result = count_content_block_tokens(block)
-        assert result == 0
-
-    def test_unknown_block_type(self) -> None:
-        """Test unknown block type returns 0."""
-        block = {"type": "unknown_type", "data": "something"}
-        result = count_content_block_tokens(block)
-        assert result == 0
-
-    def test_missing_type_defaults_to_text(self) -> None:
-        """Test missing type defaults to text."""
-        block = {"text": "Some text"}
-        result = count_content_block_tokens(block)
-        assert result > 0
+    @pytest.mark.parametrize(
+        ("block", "expected"),
+        [
+            ({"type": "text", "text": ""}, 0),
+            # Text block without text key defaults to empty
+            ({"type": "text"}, 0),
+            # Images are a fixed estimate
+            ({"type": "image", "source": {"type": "base64", "data": "..."}}, 1000),
+            # Documents estimate 1 token per 6 base64 chars (120 / 6)
+            ({"type": "document", "source": {"type": "base64", "data": "A" * 120}}, 20),
+            # ...or 1500 when there is no data to measure
+            ({"type": "document", "source": {}}, 1500),
+            ({"type": "document", "source": {"data": ""}}, 1500),
+            ({"type": "tool_result", "content": ""}, 0),
+            ({"type": "unknown_type", "data": "something"}, 0),
+        ],
+        ids=[
+            "text_empty",
+            "text_missing_text_key",
+            "image",
+            "document_with_data",
+            "document_without_data",
+            "document_empty_data",
+            "tool_result_empty_content",
+            "unknown_type",
+        ],
+    )
+    def test_fixed_count(self, block: dict[str, Any], expected: int) -> None:
+        """Test blocks with an exact or estimated token count."""
+        assert count_content_block_tokens(block) == expected
+
+    @pytest.mark.parametrize(
+        "block",
+        [
+            {"type": "text", "text": "Hello, Claude!"},
+            {"type": "tool_use", "name": "get_weather", "input": {"location": "London"}},
+            # At least the tool name tokens
+            {"type": "tool_use", "name": "simple_tool", "input": {}},
+            {"type": "tool_result", "content": "The weather in London is sunny."},
+            {
+                "type": "tool_result",
+                "content": [
+                    {"type": "text", "text": "Result part 1"},
+                    {"type": "text", "text": "Result part 2"},
+                ],
+            },
+            # Missing type defaults to text
+            {"text": "Some text"},
+        ],
+        ids=[
+            "text",
+            "tool_use",
+            "tool_use_empty_input",
+            "tool_result_string_content",
+            "tool_result_list_content",
+            "missing_type_defaults_to_text",
+        ],
+    )
+    def test_counts_content(self, block: dict[str, Any]) -> None:
+        """Test blocks whose content is tokenized."""
+        assert count_content_block_tokens(block) > 0
 
 
 class TestCountMessageTokens:
@@ -184,16 +175,7 @@ class TestCountToolDefinitionTokens:
 
     def test_tool_with_description(self) -> None:
         """Test counting tokens in tool with description."""
-        tool = {
-            "name": "get_weather",
-            "description": "Get the current weather for a location",
-            "input_schema": {
-                "type": "object",
-                "properties": {"location": {"type": "string"}},
-                "required": ["location"],
-            },
-        }
-        result = count_tool_definition_tokens(tool)
+        result = count_tool_definition_tokens(_WEATHER_TOOL)
         assert result > 0
 
     def test_tool_without_description(self) -> None:
@@ -231,41 +213,32 @@ class TestCountToolDefinitionTokens:
 class TestCountSystemPromptTokens:
     """Test the count_system_prompt_tokens function."""
 
-    def test_none_system_prompt(self) -> None:
-        """Test None system prompt returns 0."""
-        result = count_system_prompt_tokens(None)
-        assert result == 0
-
-    def test_string_system_prompt(self) -> None:
-        """Test string system prompt."""
-        result = count_system_prompt_tokens("You are a helpful assistant.")
-        assert result > 0
-
-    def test_empty_string_system_prompt(self) -> None:
-        """Test empty string system prompt."""
-        result = count_system_prompt_tokens("")
-        assert result == 0
-
-    def test_list_system_prompt(self) -> None:
-        """Test list of content blocks as system prompt."""
-        system = [
-            {"type": "text", "text": "You are helpful."},
-            {"type": "text", "text": "Be concise."},
-        ]
-        result = count_system_prompt_tokens(system)
-        assert result > 0
-
-    def test_list_with_non_dict_items(self) -> None:
-        """Test list with non-dict items are skipped."""
-        system = [
-            {"type": "text", "text": "Valid block"},
-            "not a dict",
-            123,
-            {"type": "text", "text": "Another valid block"},
-        ]
-        result = count_system_prompt_tokens(system)  # type: ignore[arg-type]
-        # Should only count the dict blocks
-        assert result > 0
+    @pytest.mark.parametrize("system", [None, ""], ids=["none", "empty_string"])
+    def test_empty_system_prompt(self, system: str | None) -> None:
+        """Test a missing or empty system prompt counts as 0."""
+        assert count_system_prompt_tokens(system) == 0
+
+    @pytest.mark.parametrize(
+        "system",
+        [
+            "You are a helpful assistant.",
+            [
+                {"type": "text", "text": "You are helpful."},
+                {"type": "text", "text": "Be concise."},
+            ],
+            # Non-dict items are skipped; only the dict blocks are counted
+            [
+                {"type": "text", "text": "Valid block"},
+                "not a dict",
+                123,
+                {"type": "text", "text": "Another valid block"},
+            ],
+        ],
+        ids=["string", "list", "list_with_non_dict_items"],
+    )
+    def test_counts_system_prompt(self, system: str | list[Any]) -> None:
+        """Test string and content block system prompts are tokenized."""
+        assert count_system_prompt_tokens(system) > 0
 
 
 class TestCountRequestTokens:
@@ -281,71 +254,37 @@ class TestCountRequestTokens:
         # Should include message tokens + 10 overhead
         assert result > 10
 
-    def test_with_system_prompt(self) -> None:
-        """Test counting with system prompt."""
-        messages = [{"role": "user", "content": "Hello"}]
-        system = "You are helpful."
-        result = count_request_tokens(messages, system=system)
+    @pytest.fixture(scope="module")
+    def hello_baseline(self) -> int:
+        """Token count of _HELLO_MESSAGES alone, for the with-extras tests."""
+        return count_request_tokens(_HELLO_MESSAGES)
 
-        # Compare to messages only
-        messages_only = count_request_tokens(messages)
-        assert result > messages_only
+    def test_with_system_prompt(self, hello_baseline: int) -> None:
+        """Test counting with system prompt."""
+        result = count_request_tokens(_HELLO_MESSAGES, system="You are helpful.")
+        assert result > hello_baseline
 
-    def test_with_tools(self) -> None:
+    def test_with_tools(self, hello_baseline: int) -> None:
         """Test counting with tools."""
-        messages = [{"role": "user", "content": "Hello"}]
-        tools = [
-            {
-                "name": "get_weather",
-                "description": "Get weather",
-                "input_schema": {"type": "object"},
-            }
-        ]
-        result = count_request_tokens(messages, tools=tools)
-
-        # Compare to messages only
-        messages_only = count_request_tokens(messages)
-        assert result > messages_only
+        result = count_request_tokens(_HELLO_MESSAGES, tools=[_WEATHER_TOOL])
+        assert result > hello_baseline
 
-    def test_with_all_parameters(self) -> None:
+    def test_with_all_parameters(self, hello_baseline: int) -> None:
         """Test counting with all parameters."""
-        messages = [{"role": "user", "content": "What's the weather?"}]
-        system = "You are a weather assistant."
-        tools = [
-            {
-                "name": "get_weather",
-                "description": "Get the current weather",
-                "input_schema": {"type": "object", "properties": {"location": {"type": "string"}}},
-            }
-        ]
-        result = count_request_tokens(messages, system=system, tools=tools)
-
-        # Should be larger than with just messages
-        messages_only = count_request_tokens(messages)
-        assert result > messages_only + 10
+        result = count_request_tokens(
+            _HELLO_MESSAGES, system="You are a weather assistant.", tools=[_WEATHER_TOOL]
+        )
+        assert result > hello_baseline + 10
 
     def test_empty_messages(self) -> None:
-        """Test with empty messages list."""
-        result = count_request_tokens([])
-        # Should just be the 10 token overhead
-        assert result == 10
-
-    def test_includes_formatting_overhead(self) -> None:
-        """Test that 10 token formatting overhead is included."""
-        # Empty request should have exactly 10 tokens overhead
+        """Test an empty request is just the 10 token formatting overhead."""
         result = count_request_tokens([])
         assert result == 10
 
-    def test_none_tools_handled(self) -> None:
-        """Test that None tools is handled."""
-        messages = [{"role": "user", "content": "Hello"}]
-        result = count_request_tokens(messages, tools=None)
-        assert result > 0
-
-    def test_empty_tools_list(self) -> None:
-        """Test that empty tools list is handled."""
-        messages = [{"role": "user", "content": "Hello"}]
-        result = count_request_tokens(messages, tools=[])
+    @pytest.mark.parametrize("tools", [None, []], ids=["none", "empty_list"])
+    def test_no_tools_handled(self, tools: list[dict[str, Any]] | None) -> None:
+        """Test that None or an empty tools list is handled."""
+        result = count_request_tokens(_HELLO_MESSAGES, tools=tools)
         assert result > 0
 
 
@@ -356,6 +295,7 @@ class TestTiktokenAvailability:
         """Test TIKTOKEN_AVAILABLE is a boolean."""
         assert isinstance(TIKTOKEN_AVAILABLE, bool)
 
+    @pytest.mark.skipif(not TIKTOKEN_AVAILABLE, reason="tiktoken not installed")
     def test_tiktoken_produces_consistent_results(self) -> None:
         """Test that tiktoken produces consistent token counts."""
         text = "The quick brown fox"
@@ -363,13 +303,40 @@ class TestTiktokenAvailability:
         result2 = count_tokens(text)
         assert result1 == result2
 
-    def test_fallback_estimation(self) -> None:
+    def test_repeated_text_is_encoded_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test count_tokens serves repeated text from the cache."""
+        encoder = MagicMock()
+        encoder.encode.return_value = [1, 2, 3]
+        monkeypatch.setattr(tokenizer, "_encoder", encoder)
+        # A fresh cache, so the fake encoder's counts don't outlive this test
+        monkeypatch.setattr(tokenizer, "_token_counts", {})
+
+        assert count_tokens("The quick brown fox") == 3
+        assert count_tokens("The quick brown fox") == 3
+        encoder.encode.assert_called_once_with("The quick brown fox")
+
+    def test_cache_is_bounded_and_keeps_no_text(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the cache evicts old entries and is keyed by digest, not text."""
+        encoder = MagicMock()
+        encoder.encode.return_value = [1]
+        monkeypatch.setattr(tokenizer, "_encoder", encoder)
+        monkeypatch.setattr(tokenizer, "_token_counts", {})
+        monkeypatch.setattr(tokenizer, "_TOKEN_COUNT_CACHE_SIZE", 2)
+
+        for text in ("first", "second", "third"):
+            count_tokens(text)
+
+        assert len(tokenizer._token_counts) == 2
+        assert all(len(key) == 16 for key in tokenizer._token_counts)
+        count_tokens("first")
+        assert encoder.encode.call_count == 4
+
+    def test_fallback_estimation(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test fallback estimation when tiktoken encoder is not available."""
-        from unittest.mock import patch
-
-        # Mock _encoder to None to test fallback path
-        with patch("src.sdk.tokenizer._encoder", None):
-            # Fallback is len(text) // 4
-            text = "12345678"  # 8 chars
-            result = count_tokens(text)
-            assert result == 2  # 8 // 4 = 2
+        # Drop the encoder to test the fallback path; monkeypatch restores it
+        monkeypatch.setattr(tokenizer, "_encoder", None)
+
+        # Fallback is len(text) // 4
+        text = "12345678"  # 8 chars
+        result = count_tokens(text)
+        assert result == 2  # 8 // 4 = 2
@@ -1,6 +1,11 @@
 """Unit tests for tool observability module."""
 
+import sys
 import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
 
 from src.core.tool_observability import (
     SENSITIVE_PATTERNS,
@@ -9,11 +14,20 @@ from src.core.tool_observability import (
     complete_tool_invocation,
     extract_tool_metadata,
     get_pending_invocations,
+    get_pending_invocations_view,
     sanitize_for_logging,
     start_tool_invocation,
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_pending() -> Iterator[None]:
+    """Start every test with no pending invocations and leave none behind."""
+    clear_pending_invocations()
+    yield
+    clear_pending_invocations()
+
+
 class TestToolInvocationState:
     """Test ToolInvocationState dataclass."""
 
@@ -328,6 +342,19 @@ class TestSanitizeForLogging:
         assert sanitized["items"][0]["secret"] == "[REDACTED]"
         assert sanitized["items"][1]["token"] == "[REDACTED]"
 
+    def test_sanitizes_deeply_nested_dicts(self) -> None:
+        """Test nesting deeper than the recursion limit is sanitized."""
+        depth = sys.getrecursionlimit() + 100
+        data: dict[str, Any] = {"password": "secret123"}
+        for _ in range(depth):
+            data = {"nested": data}
+
+        result = sanitize_for_logging(data)
+
+        for _ in range(depth):
+            result = result["nested"]
+        assert result == {"password": "[REDACTED]"}
+
     def test_preserves_non_string_values(self) -> None:
         """Test that non-string values are preserved."""
         data = {
@@ -370,14 +397,16 @@ class TestSensitivePatterns:
         for pattern in required_patterns:
             assert pattern in SENSITIVE_PATTERNS, f"Missing pattern: {pattern}"
 
+    def test_every_pattern_is_redacted(self) -> None:
+        """Test each configured pattern still triggers redaction in keys."""
+        for pattern in SENSITIVE_PATTERNS:
+            result = sanitize_for_logging({f"x_{pattern.upper()}_y": "value"})
+            assert result == {f"x_{pattern.upper()}_y": "[REDACTED]"}, pattern
+
 
 class TestStartToolInvocation:
     """Test start_tool_invocation function."""
 
-    def setup_method(self) -> None:
-        """Clear pending invocations before each test."""
-        clear_pending_invocations()
-
     def test_starts_tracking(self) -> None:
         """Test that invocation is tracked."""
         state = start_tool_invocation(
@@ -441,10 +470,6 @@ class TestStartToolInvocation:
 class TestCompleteToolInvocation:
     """Test complete_tool_invocation function."""
 
-    def setup_method(self) -> None:
-        """Clear pending invocations before each test."""
-        clear_pending_invocations()
-
     def test_completes_and_returns_state(self) -> None:
         """Test that completion returns state with duration."""
         start_tool_invocation(
@@ -484,10 +509,6 @@ class TestCompleteToolInvocation:
 class TestGetPendingInvocations:
     """Test get_pending_invocations function."""
 
-    def setup_method(self) -> None:
-        """Clear pending invocations before each test."""
-        clear_pending_invocations()
-
     def test_returns_copy(self) -> None:
         """Test that returns a copy, not the original."""
         start_tool_invocation(
@@ -509,6 +530,23 @@ class TestGetPendingInvocations:
         pending = get_pending_invocations()
         assert len(pending) == 0
 
+    def test_view_is_live_and_read_only(self) -> None:
+        """Test the view tracks pending invocations without allowing writes."""
+        view = get_pending_invocations_view()
+        state = start_tool_invocation(
+            tool_use_id="tool_123",
+            tool_name="Read",
+            tool_input={},
+            session_id="sess_456",
+        )
+
+        assert view["tool_123"] is state
+        with pytest.raises(TypeError):
+            view["tool_456"] = state  # type: ignore[index]
+
+        complete_tool_invocation("tool_123")
+        assert "tool_123" not in view
+
 
 class TestClearPendingInvocations:
     """Test clear_pending_invocations function."""
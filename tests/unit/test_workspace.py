@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-import json
+import uuid
 from pathlib import Path
+from typing import Any
+
+import pytest
 
 from src.sdk.workspace import (
     WorkspaceConfig,
@@ -12,13 +15,16 @@ from src.sdk.workspace import (
     load_workspace,
 )
 
+# Default config shared by tests that only read it
+_EMPTY_CONFIG = WorkspaceConfig()
+
 
 class TestWorkspaceConfig:
     """Tests for WorkspaceConfig dataclass."""
 
     def test_empty_config(self) -> None:
         """Test empty workspace config."""
-        config = WorkspaceConfig()
+        config = _EMPTY_CONFIG
         assert config.claude_md is None
         assert config.mcp_config is None
         assert config.commands == {}
@@ -27,8 +33,7 @@ class TestWorkspaceConfig:
 
     def test_has_extensions_empty(self) -> None:
         """Test has_extensions is False for empty config."""
-        config = WorkspaceConfig()
-        assert config.has_extensions is False
+        assert _EMPTY_CONFIG.has_extensions is False
 
     def test_has_extensions_with_claude_md(self) -> None:
         """Test has_extensions is True with CLAUDE.md."""
@@ -50,9 +55,9 @@ class TestLoadWorkspace:
         assert config.claude_md is None
         assert config.commands == {}
 
-    def test_load_nonexistent_directory(self, tmp_path: Path) -> None:
+    def test_load_nonexistent_directory(self) -> None:
         """Test loading from nonexistent directory."""
-        nonexistent = tmp_path / "nonexistent"
+        nonexistent = Path("/__nonexistent__") / uuid.uuid4().hex
         config = load_workspace(nonexistent)
         assert config.claude_md is None
 
@@ -62,83 +67,130 @@ class TestLoadWorkspace:
         assert config.claude_md is None
         assert config.commands == {}
 
-    def test_load_claude_md(self, tmp_path: Path) -> None:
-        """Test loading CLAUDE.md."""
-        (tmp_path / "CLAUDE.md").write_text("# Project Rules\n\nDo good things.")
+    def test_load_normalizes_line_endings(self, tmp_path: Path) -> None:
+        """Test CRLF and CR line endings are read as newlines."""
+        (tmp_path / "CLAUDE.md").write_bytes(b"# Rules\r\n\r\nBe nice.\rBe brief.\r\n")
+
         config = load_workspace(tmp_path)
-        assert config.claude_md == "# Project Rules\n\nDo good things."
+        assert config.claude_md == "# Rules\n\nBe nice.\nBe brief."
 
-    def test_load_mcp_json(self, tmp_path: Path) -> None:
+    @pytest.fixture(scope="class")
+    def loaded_workspace(self, tmp_path_factory: pytest.TempPathFactory) -> WorkspaceConfig:
+        """Load one fully populated workspace; tests only read it."""
+        root = tmp_path_factory.mktemp("workspace")
+        (root / "CLAUDE.md").write_bytes(b"# Project Rules\n\nDo good things.")
+        (root / ".mcp.json").write_bytes(b'{"mcpServers": {"test": {"command": "test"}}}')
+        claude_dir = root / ".claude"
+
+        commands_dir = claude_dir / "commands"
+        commands_dir.mkdir(parents=True)
+        (commands_dir / "commit.md").write_bytes(b"# /commit\n\nCommit changes")
+        (commands_dir / "pr.md").write_bytes(b"# /pr\n\nCreate PR")
+
+        skill_dir = claude_dir / "skills" / "database"
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_bytes(b"# Database Skill\n\nHandle DB operations")
+
+        agents_dir = claude_dir / "agents"
+        agents_dir.mkdir(parents=True)
+        (agents_dir / "code-reviewer.md").write_bytes(b"# Code Reviewer\n\nReview code")
+
+        return load_workspace(root)
+
+    def test_load_claude_md(self, loaded_workspace: WorkspaceConfig) -> None:
+        """Test loading CLAUDE.md."""
+        assert loaded_workspace.claude_md == "# Project Rules\n\nDo good things."
+
+    def test_load_mcp_json(self, loaded_workspace: WorkspaceConfig) -> None:
         """Test loading .mcp.json."""
-        mcp_config = {"mcpServers": {"test": {"command": "test"}}}
-        (tmp_path / ".mcp.json").write_text(json.dumps(mcp_config))
-        config = load_workspace(tmp_path)
-        assert config.mcp_config == mcp_config
+        assert loaded_workspace.mcp_config == {"mcpServers": {"test": {"command": "test"}}}
 
-    def test_load_commands(self, tmp_path: Path) -> None:
+    def test_load_commands(self, loaded_workspace: WorkspaceConfig) -> None:
         """Test loading commands."""
+        assert "commit" in loaded_workspace.commands
+        assert "pr" in loaded_workspace.commands
+        assert "# /commit" in loaded_workspace.commands["commit"]
+
+    def test_load_skills(self, loaded_workspace: WorkspaceConfig) -> None:
+        """Test loading skills."""
+        assert "database" in loaded_workspace.skills
+        assert "Database Skill" in loaded_workspace.skills["database"]
+
+    def test_load_agents(self, loaded_workspace: WorkspaceConfig) -> None:
+        """Test loading agents."""
+        assert "code-reviewer" in loaded_workspace.agents
+        assert "Code Reviewer" in loaded_workspace.agents["code-reviewer"]
+
+    def test_skips_non_markdown_entries(self, tmp_path: Path) -> None:
+        """Test only *.md files and skill dirs with SKILL.md are loaded."""
         commands_dir = tmp_path / ".claude" / "commands"
-        commands_dir.mkdir(parents=True)
-        (commands_dir / "commit.md").write_text("# /commit\n\nCommit changes")
-        (commands_dir / "pr.md").write_text("# /pr\n\nCreate PR")
+        (commands_dir / "nested.md").mkdir(parents=True)
+        (commands_dir / "notes.txt").write_bytes(b"not a command")
+        (commands_dir / "deploy.md").write_bytes(b"Deploy")
+        (tmp_path / ".claude" / "skills" / "empty").mkdir(parents=True)
 
         config = load_workspace(tmp_path)
-        assert "commit" in config.commands
-        assert "pr" in config.commands
-        assert "# /commit" in config.commands["commit"]
+        assert config.commands == {"deploy": "Deploy"}
+        assert config.skills == {}
 
-    def test_load_skills(self, tmp_path: Path) -> None:
-        """Test loading skills."""
-        skill_dir = tmp_path / ".claude" / "skills" / "database"
-        skill_dir.mkdir(parents=True)
-        (skill_dir / "SKILL.md").write_text("# Database Skill\n\nHandle DB operations")
+    def test_skips_unreadable_directories(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test an unreadable .claude subdirectory is skipped, not raised."""
+        (tmp_path / "CLAUDE.md").write_bytes(b"Rules")
+        (tmp_path / ".claude" / "commands").mkdir(parents=True)
 
-        config = load_workspace(tmp_path)
-        assert "database" in config.skills
-        assert "Database Skill" in config.skills["database"]
+        def denied(path: Any) -> Any:
+            raise PermissionError(13, "Permission denied", str(path))
 
-    def test_load_agents(self, tmp_path: Path) -> None:
-        """Test loading agents."""
-        agents_dir = tmp_path / ".claude" / "agents"
-        agents_dir.mkdir(parents=True)
-        (agents_dir / "code-reviewer.md").write_text("# Code Reviewer\n\nReview code")
+        monkeypatch.setattr("src.sdk.workspace.os.scandir", denied)
 
         config = load_workspace(tmp_path)
-        assert "code-reviewer" in config.agents
-        assert "Code Reviewer" in config.agents["code-reviewer"]
+        assert config.claude_md == "Rules"
+        assert config.commands == {}
 
 
 class TestExpandCommand:
     """Tests for expand_command function."""
 
-    def test_no_command_prefix(self) -> None:
-        """Test prompt without / prefix."""
-        workspace = WorkspaceConfig(commands={"commit": "Commit instructions"})
-        expanded, cmd = expand_command("Hello world", workspace)
-        assert expanded == "Hello world"
-        assert cmd is None
-
-    def test_unknown_command(self) -> None:
-        """Test unknown command passes through."""
-        workspace = WorkspaceConfig(commands={"commit": "Commit instructions"})
-        expanded, cmd = expand_command("/unknown", workspace)
-        assert expanded == "/unknown"
-        assert cmd is None
-
-    def test_expand_command_without_args(self) -> None:
-        """Test expanding command without additional args."""
-        workspace = WorkspaceConfig(commands={"commit": "Commit instructions"})
-        expanded, cmd = expand_command("/commit", workspace)
-        assert expanded == "Commit instructions"
-        assert cmd == "commit"
-
-    def test_expand_command_with_args(self) -> None:
-        """Test expanding command with additional args."""
-        workspace = WorkspaceConfig(commands={"commit": "Commit instructions"})
-        expanded, cmd = expand_command("/commit fix bug in auth", workspace)
-        assert "Commit instructions" in expanded
-        assert "User input: fix bug in auth" in expanded
-        assert cmd == "commit"
+    @pytest.fixture(scope="class")
+    def workspace(self) -> WorkspaceConfig:
+        """Workspace with a single /commit command; expand_command only reads it."""
+        return WorkspaceConfig(commands={"commit": "Commit instructions"})
+
+    @pytest.mark.parametrize(
+        ("prompt", "expected", "expected_cmd"),
+        [
+            ("Hello world", "Hello world", None),
+            # Unknown commands and a bare / pass through
+            ("/unknown", "/unknown", None),
+            ("/", "/", None),
+            ("/commit", "Commit instructions", "commit"),
+            (
+                "/commit fix bug in auth",
+                "Commit instructions\n\nUser input: fix bug in auth",
+                "commit",
+            ),
+        ],
+        ids=[
+            "no_command_prefix",
+            "unknown_command",
+            "bare_slash",
+            "without_args",
+            "with_args",
+        ],
+    )
+    def test_expand_command(
+        self,
+        workspace: WorkspaceConfig,
+        prompt: str,
+        expected: str,
+        expected_cmd: str | None,
+    ) -> None:
+        """Test /command detection and expansion."""
+        expanded, cmd = expand_command(prompt, workspace)
+        assert expanded == expected
+        assert cmd == expected_cmd
 
 
 class TestGetProjectInstructions:
@@ -146,8 +198,7 @@ class TestGetProjectInstructions:
 
     def test_returns_none_for_empty_workspace(self) -> None:
         """Test returns None when no CLAUDE.md present."""
-        workspace = WorkspaceConfig()
-        result = get_project_instructions(workspace)
+        result = get_project_instructions(_EMPTY_CONFIG)
         assert result is None
 
     def test_returns_none_with_only_commands(self) -> None:
@@ -160,10 +211,7 @@ class TestGetProjectInstructions:
         """Test returns CLAUDE.md content wrapped in XML tags."""
         workspace = WorkspaceConfig(claude_md="Project specific rules")
         result = get_project_instructions(workspace)
-        assert result is not None
-        assert "<project-instructions>" in result
-        assert "Project specific rules" in result
-        assert "</project-instructions>" in result
+        assert result == "<project-instructions>\nProject specific rules\n</project-instructions>"
 
     def test_ignores_skills_agents_commands(self) -> None:
         """Test only returns CLAUDE.md, ignores other extensions."""
@@ -174,9 +222,5 @@ class TestGetProjectInstructions:
             agents={"reviewer": "..."},
         )
         result = get_project_instructions(workspace)
-        assert result is not None
-        assert "My rules" in result
-        # Should not include other extensions
-        assert "commit" not in result
-        assert "db" not in result
-        assert "reviewer" not in result
+        # Exact match, so no other extension can have leaked in
+        assert result == "<project-instructions>\nMy rules\n</project-instructions>"